@@ -122,11 +122,15 @@ def _fix_file_ownership(path):
 
 def _write_log(entry):
     """Write log entry to file and buffer"""
-    if not ENABLED:
+    _write_logs((entry,))
+
+def _write_logs(entries):
+    """Write a batch of log entries with a single file open"""
+    if not ENABLED or not entries:
         return
     
     with _lock:
-        _log_buffer.append(entry)
+        _log_buffer.extend(entries)
         
         try:
             # Check file size and rotate if needed
@@ -137,7 +141,7 @@ def _write_log(entry):
             file_existed = DEBUG_LOG_PATH.exists()
             
             with open(DEBUG_LOG_PATH, 'a', encoding='utf-8') as f:
-                f.write(entry + '\n')
+                f.writelines(f"{entry}\n" for entry in entries)
             
             # Fix ownership if we just created the file
             if not file_existed:
@@ -180,6 +184,15 @@ def log(level, category, message, data=None, exc_info=False):
         data: Optional dict/object with additional data
         exc_info: Include exception traceback
     """
+    entry = _format_entry(level, category, message, data, exc_info)
+    _write_log(entry)
+    
+    # Also print to console for immediate visibility
+    if level in ('ERROR', 'FATAL', 'WARN'):
+        print(entry, file=sys.stderr)
+
+def _format_entry(level, category, message, data=None, exc_info=False):
+    """Format a single log line (shared by log() and batched writers)"""
     ts = _format_timestamp()
     
     # Format the log line
@@ -191,12 +204,7 @@ def log(level, category, message, data=None, exc_info=False):
     if exc_info:
         parts.append(f"\n{''.join(traceback.format_exc())}")
     
-    entry = ' '.join(parts)
-    _write_log(entry)
-    
-    # Also print to console for immediate visibility
-    if level in ('ERROR', 'FATAL', 'WARN'):
-        print(entry, file=sys.stderr)
+    return ' '.join(parts)
 
 def trace(cat, msg, data=None): log('TRACE', cat, msg, data)
 def debug(cat, msg, data=None): log('DEBUG', cat, msg, data)
@@ -357,7 +365,8 @@ def log_client_event(event_data):
 def log_client_logs(log_bundle, client_ip=None):
     """
     Log a bundle of client-side logs received from browser.
-    Writes each log entry with CLIENT prefix.
+    Writes each log entry with CLIENT prefix. Entries are formatted into
+    a batch and written with a single file open.
     
     Features for AI debugging:
     - Detects client JS version from state
@@ -370,12 +379,20 @@ def log_client_logs(log_bundle, client_ip=None):
         return
     
     all_logs = log_bundle.get('allLogs', [])
-    info('CLIENT', f'=== Received {len(all_logs)} client logs ===')
+    batch = []
+    
+    def add(level, category, message, data=None):
+        entry = _format_entry(level, category, message, data)
+        batch.append(entry)
+        if level in ('ERROR', 'FATAL', 'WARN'):
+            print(entry, file=sys.stderr)
+    
+    add('INFO', 'CLIENT', f'=== Received {len(all_logs)} client logs ===')
     
     # Detect client JS version from state
     if 'state' in log_bundle:
         state = log_bundle['state']
-        debug('CLIENT', 'Client state snapshot', state)
+        add('DEBUG', 'CLIENT', 'Client state snapshot', state)
         
         # Check if client reports endpoints it's calling
         if client_ip and 'config' in state:
@@ -410,9 +427,9 @@ def log_client_logs(log_bundle, client_ip=None):
         for error_key, count in error_counts.items():
             level, msg = error_key.split(':', 1)
             if count > 1:
-                warn('CLI/ERROR', f'[x{count}] {msg}', {'repeated_count': count})
+                add('WARN', 'CLI/ERROR', f'[x{count}] {msg}', {'repeated_count': count})
             else:
-                log(level, 'CLI/ERROR', msg)
+                add(level, 'CLI/ERROR', msg)
     
     # Log other entries
     for entry in other_logs:
@@ -421,7 +438,7 @@ def log_client_logs(log_bundle, client_ip=None):
         msg = entry.get('msg', '')
         data = entry.get('data')
         
-        log(level, cat[:12], msg, data)
+        add(level, cat[:12], msg, data)
     
     # Check if client is calling expected endpoints (detect old JS)
     all_logs_str = str(all_logs)
@@ -433,11 +450,13 @@ def log_client_logs(log_bundle, client_ip=None):
             missing_calls.append('/api/metrics/sparklines')
     
     if missing_calls:
-        warn('CLIENT', f'⚠️ Client NOT calling expected endpoints (OLD JS?)', {
+        add('WARN', 'CLIENT', f'⚠️ Client NOT calling expected endpoints (OLD JS?)', {
             'missing': missing_calls,
             'advice': 'Client may have old cached JavaScript. User needs Ctrl+F5.',
             'client_ip': client_ip
         })
+    
+    _write_logs(batch)
 
 # =============================================================================
 # HTTP REQUEST/RESPONSE LOGGING
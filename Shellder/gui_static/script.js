@@ -1136,6 +1136,12 @@ function initWebSocket() {
             updateServiceStatus(data);
         });
         
+        // Coalesced collector updates - one frame carrying several stats
+        socket.on('stats_delta', (delta) => {
+            if (delta.port_status) updatePortStatus(delta.port_status);
+            if (delta.service_status) updateServiceStatus(delta.service_status);
+        });
+        
         // Disk auto-cleanup notification
         socket.on('disk_cleanup', (data) => {
             showToast(`🧹 Auto-cleanup freed ${data.freed}! (${data.reason})`, 'success');
@@ -588,6 +588,12 @@ server {
         proxy_cache_valid 200 1d;
         ${AUTH_BLOCK}
     }
+    
+    # Debug log downloads handed off by Shellder (SHELLDER_ACCEL_REDIRECT=/internal/shellder-logs/)
+    location /internal/shellder-logs/ {
+        internal;
+        alias ${SCRIPT_DIR}/logs/;
+    }
 }
 EOF
     
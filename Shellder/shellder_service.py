@@ -35,6 +35,8 @@ SHELLDER_BUILD = "20251220-01"  # Date-based build number
 try:
     import eventlet
     eventlet.monkey_patch()
+    from eventlet import tpool
+    from eventlet.hubs import trampoline
     ASYNC_MODE = 'eventlet'
 except ImportError:
     ASYNC_MODE = 'threading'
@@ -49,19 +51,30 @@ except Exception as e:
 import os
 import sys
 import json
+import codecs
+import csv
+import io
 import toml
 import time
 import threading
+import queue
 import re
 import signal
 import sqlite3
 import subprocess
+import shlex
 import socket
+import platform
+import select
+import errno
+import heapq
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from collections import defaultdict
-from functools import wraps
+from collections import defaultdict, deque, OrderedDict
+from itertools import islice
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait as wait_futures, FIRST_COMPLETED
 import shutil
 
 # =============================================================================
@@ -123,6 +136,11 @@ except ImportError as e:
     IS_UNIX = IS_LINUX or IS_MACOS
     PLATFORM_NAME = 'Unknown'
     PTY_AVAILABLE = False
+    try:
+        import pwd, grp
+    except ImportError:
+        pwd = grp = None
+    pty = None
     print(f"Warning: platform_compat not available: {e}")
     # Define stubs
     def get_current_user(): import getpass; return getpass.getuser()
@@ -141,13 +159,21 @@ except ImportError as e:
 
 # Flask and WebSocket
 try:
-    from flask import Flask, render_template, jsonify, request, Response, send_from_directory
+    from flask import Flask, render_template, jsonify, request, Response, send_from_directory, stream_with_context
+    from flask.json.provider import DefaultJSONProvider
     from flask_cors import CORS
 except ImportError:
     print("Error: Flask is not installed.")
     print("Run: pip install flask flask-cors")
     sys.exit(1)
 
+# Response compression for large JSON/text payloads (optional)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
 try:
     from flask_socketio import SocketIO, emit
     SOCKETIO_AVAILABLE = True
@@ -170,6 +196,51 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     print("Warning: psutil not available, limited system stats")
 
+# Threaded production WSGI server, used when eventlet is unavailable
+try:
+    from waitress import serve as waitress_serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Native MySQL driver for ad-hoc queries (optional - falls back to the mysql CLI)
+try:
+    import pymysql
+    PYMYSQL_AVAILABLE = True
+except ImportError:
+    PYMYSQL_AVAILABLE = False
+# Renders PyMySQL row values the way the mysql CLI prints them
+from sql_values import sql_value
+
+# Fast JSON serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# In-process git metadata reads via libgit2 (optional)
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+# Linux file change notifications for log streaming (optional)
+try:
+    if ASYNC_MODE == 'eventlet':
+        # inotify_simple does `from select import poll`, which eventlet's green
+        # select drops - load it against the real module. Its blocking poll() is
+        # never used: LogDirWatcher waits on the fd with trampoline() instead.
+        _inotify_simple = eventlet.patcher.import_patched(
+            'inotify_simple', select=eventlet.patcher.original('select'))
+    else:
+        import inotify_simple as _inotify_simple
+    INotify, inotify_flags = _inotify_simple.INotify, _inotify_simple.flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -199,7 +270,10 @@ except ImportError as e:
     def get_path(s, k): return None
 
 SHELLDER_PORT = int(os.environ.get('SHELLDER_PORT', 5000))
+WSGI_THREADS = int(os.environ.get('SHELLDER_WSGI_THREADS', 16))  # waitress fallback only
 AEGIS_ROOT = Path(os.environ.get('AEGIS_ROOT', '/aegis'))
+# Resolved once - file endpoints compare request paths against this
+_AEGIS_ROOT_RESOLVED = AEGIS_ROOT.resolve()
 
 # Local testing mode - provides mock data when Docker/stack not available
 LOCAL_MODE = os.environ.get('SHELLDER_LOCAL_MODE', '0') == '1'
@@ -329,6 +403,67 @@ app = Flask(__name__,
             static_folder=str(STATIC_DIR))
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'shellder-secret-key')
 CORS(app)
+if COMPRESS_AVAILABLE:
+    # File reads, log tails and docker inspect output compress 5-10x. Streamed
+    # responses are left alone so live log lines aren't held in the gzip buffer.
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/plain']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    app.config['COMPRESS_LEVEL'] = 4
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson instead of the stdlib encoder.
+    
+    Types orjson doesn't handle natively (datetimes, Decimal, ...) go through
+    Flask's default hook, and keys are sorted when sort_keys is set, as with
+    the default provider. Two differences remain: non-ASCII text is emitted as
+    UTF-8 rather than \\u escapes (ensure_ascii is ignored), and NaN/Infinity
+    serialize as null.
+    """
+    
+    _OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if ORJSON_AVAILABLE else 0
+    
+    def _option(self):
+        """orjson option flags matching this provider's settings"""
+        option = self._OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        # Only indent/separators are translated - anything else uses the stdlib path
+        if set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        option = self._option()
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """jsonify(): hand orjson's bytes straight to the response (no decode/re-encode)"""
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._option()
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # =============================================================================
 # HTTP REQUEST/RESPONSE LOGGING
@@ -4551,6 +4686,7 @@ class StatsCollector:
     POLL_SLOW_LOGS = 60          # Log parsing when idle
     POLL_PORTS = 60              # Was 30s - port scanning
     POLL_SERVICES = 120          # Was 60s - system services check
+    EMIT_COALESCE_WINDOW = 0.1   # Batch socket updates landing within 100ms into one frame
     
     def __init__(self):
         self.container_stats = {}
@@ -4626,6 +4762,13 @@ class StatsCollector:
         self.running = False
         self.lock = threading.Lock()
         
+        # Cached get_all_stats() result - reset to None by every writer
+        self._snapshot = None
+        
+        # Socket updates waiting to go out in the next 'stats_delta' frame
+        self._pending_emits = {}
+        self._emit_cv = threading.Condition(self.lock)
+        
         # Client tracking for adaptive polling
         self.connected_clients = 0
         self.last_api_request = time.time()
@@ -4687,6 +4830,9 @@ class StatsCollector:
         # Disk watchdog thread - auto-cleans known bloat
         threading.Thread(target=self._disk_watchdog, daemon=True).start()
         
+        # Coalesced socket emitter thread
+        threading.Thread(target=self._emit_loop, daemon=True).start()
+        
         print("Stats collector started with parsers for: Xilriws, Rotom, Koji, Reactmap, Database")
         print("Disk watchdog started - will auto-clean known bloat sources")
         print(f"CPU Optimization: Adaptive polling enabled")
@@ -4696,6 +4842,32 @@ class StatsCollector:
     def stop(self):
         self.running = False
     
+    def _queue_emit(self, event, data):
+        """Queue a stats update for the next coalesced 'stats_delta' emit"""
+        with self._emit_cv:
+            self._pending_emits[event] = data
+            self._emit_cv.notify()
+    
+    def _emit_loop(self):
+        """
+        Send queued stats updates as one 'stats_delta' event
+        
+        Collectors that finish within EMIT_COALESCE_WINDOW of each other share
+        a single WebSocket frame: {'port_status': {...}, 'service_status': {...}}
+        """
+        while self.running:
+            with self._emit_cv:
+                while not self._pending_emits and self.running:
+                    self._emit_cv.wait(timeout=5)
+            
+            time.sleep(self.EMIT_COALESCE_WINDOW)
+            
+            with self._emit_cv:
+                delta, self._pending_emits = self._pending_emits, {}
+            
+            if delta and socketio and SOCKETIO_AVAILABLE:
+                socketio.emit('stats_delta', delta)
+    
     def _collect_container_stats(self):
         """Collect Docker container statistics"""
         while self.running:
@@ -4775,6 +4947,7 @@ class StatsCollector:
             
             with self.lock:
                 self.container_stats = stats
+                self._snapshot = None
             
             # Emit to connected clients
             if socketio and SOCKETIO_AVAILABLE:
@@ -4847,6 +5020,7 @@ class StatsCollector:
             
             with self.lock:
                 self.system_stats = stats
+                self._snapshot = None
             
             if socketio and SOCKETIO_AVAILABLE:
                 socketio.emit('system_stats', stats)
@@ -5286,6 +5460,7 @@ class StatsCollector:
                     
                     with self.lock:
                         self.xilriws_stats = stats
+                        self._snapshot = None
                     
                     if socketio and SOCKETIO_AVAILABLE:
                         socketio.emit('xilriws_stats', stats)
@@ -5468,6 +5643,7 @@ class StatsCollector:
                     
                     with self.lock:
                         self.rotom_stats = stats
+                        self._snapshot = None
                     
                     if socketio and SOCKETIO_AVAILABLE:
                         socketio.emit('rotom_stats', stats)
@@ -5631,6 +5807,7 @@ class StatsCollector:
                     
                     with self.lock:
                         self.koji_stats = stats
+                        self._snapshot = None
                     
                     if socketio and SOCKETIO_AVAILABLE:
                         socketio.emit('koji_stats', stats)
@@ -5765,6 +5942,7 @@ class StatsCollector:
                     
                     with self.lock:
                         self.reactmap_stats = stats
+                        self._snapshot = None
                     
                     if socketio and SOCKETIO_AVAILABLE:
                         socketio.emit('reactmap_stats', stats)
@@ -5801,8 +5979,21 @@ class StatsCollector:
         aborted_conn = re.compile(r'Aborted connection\s+(\d+)\s+to db:\s*[\'"]?(\w+)[\'"]?\s+user:\s*[\'"]?(\w+)[\'"]?\s+host:\s*[\'"]?([^\'"\s]+)[\'"]?')
         version_pattern = re.compile(r"Version:\s*'([^']+)'")
         buffer_pool = re.compile(r'innodb_buffer_pool_size[_=](\d+)([mMgG]?)')
-        ready_pattern = re.compile(r'ready for connections')
         starting_pattern = re.compile(r'Starting MariaDB\s+([\d.]+)')
+        innodb_info = re.compile(r'Compressed tables|transaction pools|undo tablespaces|rollback segments')
+        
+        # InnoDB counter keyword -> (innodb stats key, extractor)
+        innodb_counters = {
+            'transaction pools': ('transaction_pools', _int_after),   # "Number of transaction pools: 1"
+            'undo tablespaces': ('undo_tablespaces', _int_before),    # "Opened 3 undo tablespaces"
+            'rollback segments': ('rollback_segments', _int_before),  # "128 rollback segments are active."
+        }
+        
+        # Epoch second of the last parse - used as a docker `since=` cursor so an
+        # unchanged log is not re-parsed (and re-persisted) every cycle. An int,
+        # not a naive datetime: docker-py reads naive datetimes as UTC. Rounding
+        # down at worst re-parses a line from that second, never skips one.
+        log_since = None
         
         while self.running:
             if docker_client:
@@ -5812,7 +6003,15 @@ class StatsCollector:
                         time.sleep(30)
                         continue
                     
+                    poll_started = datetime.now()
+                    poll_started_ts = int(time.time())
+                    if log_since is not None and not container.logs(since=log_since, tail=1).strip():
+                        # No new lines since last parse - stats are unchanged
+                        time.sleep(self.POLL_FAST_LOGS if self.has_active_clients() else self.POLL_SLOW_LOGS)
+                        continue
+                    
                     logs = container.logs(tail=500, timestamps=False).decode('utf-8', errors='ignore')
+                    log_since = poll_started_ts
                     
                     stats = {
                         'status': 'unknown',
@@ -5824,8 +6023,8 @@ class StatsCollector:
                             'by_host': {},
                             'by_user': {}
                         },
-                        'warnings': [],
-                        'errors': [],
+                        'warnings': deque(maxlen=20),
+                        'errors': deque(maxlen=20),
                         'innodb': {
                             'buffer_pool_size': None,
                             'compressed': False,
@@ -5833,11 +6032,14 @@ class StatsCollector:
                             'undo_tablespaces': 0,
                             'rollback_segments': 0
                         },
-                        'recent_events': [],
-                        'startup_notes': [],
-                        'last_update': datetime.now().isoformat()
+                        'recent_events': deque(maxlen=50),
+                        'startup_notes': deque(maxlen=10),
+                        'last_update': poll_started.isoformat()
                     }
                     
+                    # Log level -> list that collects its messages
+                    level_buckets = {'Warning': stats['warnings'], 'Error': stats['errors']}
+                    
                     for line in logs.split('\n'):
                         if not line.strip():
                             continue
@@ -5862,26 +6064,29 @@ class StatsCollector:
                         if m:
                             thread_id, level, message = m.groups()
                             
+                            # Cheap substring checks gate each regex - most lines
+                            # match none of these, and `in` is far cheaper than SRE
+                            
                             # Ready for connections
-                            if ready_pattern.search(message):
+                            if 'ready for connections' in message:
                                 stats['status'] = 'ready'
                                 continue
                             
                             # Version
-                            m2 = version_pattern.search(message)
+                            m2 = version_pattern.search(message) if 'Version:' in message else None
                             if m2:
                                 stats['version'] = m2.group(1)
                                 continue
                             
                             # Starting
-                            m2 = starting_pattern.search(message)
+                            m2 = starting_pattern.search(message) if 'Starting MariaDB' in message else None
                             if m2:
                                 stats['version'] = m2.group(1)
                                 stats['status'] = 'starting'
                                 continue
                             
                             # Aborted connection
-                            m2 = aborted_conn.search(message)
+                            m2 = aborted_conn.search(message) if 'Aborted connection' in message else None
                             if m2:
                                 conn_id, db_name, user, host = m2.groups()
                                 stats['connections']['aborted'] += 1
@@ -5911,7 +6116,7 @@ class StatsCollector:
                                 continue
                             
                             # InnoDB buffer pool
-                            m2 = buffer_pool.search(message)
+                            m2 = buffer_pool.search(message) if 'innodb_buffer_pool_size' in message else None
                             if m2:
                                 size = int(m2.group(1))
                                 unit = m2.group(2).lower() if m2.group(2) else ''
@@ -5920,51 +6125,38 @@ class StatsCollector:
                                 stats['innodb']['buffer_pool_size'] = f"{size}MB"
                                 continue
                             
-                            # InnoDB info
+                            # InnoDB info - one scan finds whichever keyword is present
                             if 'InnoDB:' in message:
-                                if 'Compressed tables' in message:
-                                    stats['innodb']['compressed'] = True
-                                elif 'transaction pools' in message:
-                                    m2 = re.search(r'(\d+)', message)
-                                    if m2:
-                                        stats['innodb']['transaction_pools'] = int(m2.group(1))
-                                elif 'undo tablespaces' in message:
-                                    m2 = re.search(r'(\d+)\s+undo tablespaces', message)
-                                    if m2:
-                                        stats['innodb']['undo_tablespaces'] = int(m2.group(1))
-                                elif 'rollback segments' in message:
-                                    m2 = re.search(r'(\d+)\s+rollback segments', message)
-                                    if m2:
-                                        stats['innodb']['rollback_segments'] = int(m2.group(1))
-                                continue
-                            
-                            # Warnings
-                            if level == 'Warning':
-                                stats['warnings'].append({
-                                    'message': message[:150],
-                                    'time': timestamp
-                                })
+                                m2 = innodb_info.search(message)
+                                if m2:
+                                    keyword = m2.group(0)
+                                    if keyword == 'Compressed tables':
+                                        stats['innodb']['compressed'] = True
+                                    else:
+                                        key, extract = innodb_counters[keyword]
+                                        value = extract(message, keyword)
+                                        if value is not None:
+                                            stats['innodb'][key] = value
                                 continue
                             
-                            # Errors
-                            if level == 'Error':
-                                stats['errors'].append({
+                            # Warnings / Errors
+                            bucket = level_buckets.get(level)
+                            if bucket is not None:
+                                bucket.append({
                                     'message': message[:150],
                                     'time': timestamp
                                 })
                                 continue
                     
-                    # Limit arrays
-                    stats['warnings'] = stats['warnings'][-20:]
-                    stats['errors'] = stats['errors'][-20:]
-                    stats['recent_events'] = stats['recent_events'][-50:]
-                    stats['startup_notes'] = stats['startup_notes'][-10:]
+                    # Bounded deques already hold only the tail - convert for JSON
+                    for key in ('warnings', 'errors', 'recent_events', 'startup_notes'):
+                        stats[key] = list(stats[key])
                     
                     with self.lock:
                         self.database_stats = stats
+                        self._snapshot = None
                     
-                    if socketio and SOCKETIO_AVAILABLE:
-                        socketio.emit('database_stats', stats)
+                    self._queue_emit('database_stats', stats)
                     
                     # Persist to database for cross-referencing
                     shellder_db.persist_database_stats(stats)
@@ -5996,49 +6188,52 @@ class StatsCollector:
         ]
         
         while self.running:
+            # All ports are probed concurrently - one timeout per cycle, not per port
+            ports = [port for port, _ in ports_to_check]
+            try:
+                open_ports = probe_ports(ports, timeout=1)
+            except Exception:
+                # select() unusable here - fall back to one blocking probe per thread
+                open_ports = probe_ports_threaded(ports, timeout=0.5)
             status = {}
             for port, name in ports_to_check:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(1)
-                    result = sock.connect_ex(('127.0.0.1', port))
-                    sock.close()
-                    status[port] = {
-                        'port': port,
-                        'name': name,
-                        'open': result == 0
-                    }
-                except Exception:
-                    status[port] = {'port': port, 'name': name, 'open': False}
+                status[port] = {
+                    'port': port,
+                    'name': name,
+                    'open': open_ports.get(port, False)
+                }
             
             with self.lock:
                 self.port_status = status
+                self._snapshot = None
             
-            if socketio and SOCKETIO_AVAILABLE:
-                socketio.emit('port_status', status)
+            self._queue_emit('port_status', status)
             
             time.sleep(self.POLL_PORTS)  # 60 seconds
     
     def _check_system_services(self):
         """Check system services status"""
+        service_names = ['nginx', 'fail2ban', 'ufw']
+        
         while self.running:
-            services = {}
+            services = dict.fromkeys(service_names)
             
-            for service in ['nginx', 'fail2ban', 'ufw']:
-                try:
-                    result = subprocess.run(
-                        ['systemctl', 'is-active', service],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    services[service] = result.stdout.strip() == 'active'
-                except Exception:
-                    services[service] = None
+            # One systemctl call reports all units, one status per line
+            try:
+                result = subprocess.run(
+                    ['systemctl', 'is-active'] + service_names,
+                    capture_output=True, text=True, timeout=5
+                )
+                for service, state in zip(service_names, result.stdout.splitlines()):
+                    services[service] = state.strip() == 'active'
+            except Exception:
+                pass
             
             with self.lock:
                 self.service_status = services
+                self._snapshot = None
             
-            if socketio and SOCKETIO_AVAILABLE:
-                socketio.emit('service_status', services)
+            self._queue_emit('service_status', services)
             
             time.sleep(self.POLL_SERVICES)  # 120 seconds
     
@@ -6074,8 +6269,10 @@ class StatsCollector:
                     reason = f"disk at {disk_percent}%"
                 
                 # Detect bloat
-                bloat_sources = _detect_bloat()
-                large_bloat = [b for b in bloat_sources if b['total_size'] > 1024 * 1024 * 1024]  # > 1GB
+                # Only "> 1GB" matters here, so stop walking a source once it's past that
+                size_cap = 1024 * 1024 * 1024
+                bloat_sources = _detect_bloat(early_exit=size_cap)
+                large_bloat = [b for b in bloat_sources if b['total_size'] > size_cap]  # > 1GB
                 
                 if large_bloat:
                     should_clean = True
@@ -6101,30 +6298,35 @@ class StatsCollector:
                         if source['total_size'] < 100 * 1024 * 1024:
                             continue
                         
-                        size_before = source['total_size']
+                        # Paths that hit the early-exit cap only have a lower bound -
+                        # measure those in full so "freed" below is exact
+                        size_before = sum(
+                            _bloat_path_size(p['path']) if p['size'] >= size_cap else p['size']
+                            for p in source['paths']
+                        )
                         
-                        # Run cleanup commands
-                        for cmd in source_config['cleanup_commands']:
+                        # Run cleanup commands (rm -rf handled in-process)
+                        def run(cmd, expanded_cmd):
                             try:
-                                expanded_cmd = cmd
-                                for path in source_config['paths']:
-                                    if '~' in path:
-                                        expanded_cmd = expanded_cmd.replace(path, _expand_path(path))
-                                
-                                subprocess.run(
-                                    expanded_cmd,
-                                    shell=True,
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=120
-                                )
+                                return _run_cleanup_command(expanded_cmd, timeout=120, output_limit=0)[1]
                             except Exception as e:
-                                warn('DISK_WATCHDOG', f'Cleanup command failed: {cmd}', {'error': str(e)})
+                                warn('DISK_WATCHDOG', f'Cleanup command failed: {expanded_cmd}', {'error': str(e)})
                         
-                        # Calculate freed space
-                        size_after = sum(_get_dir_size(p) for p in source_config['paths'])
-                        freed = size_before - size_after
+                        removed = None
+                        for cmd_freed in _run_cleanup_phases(source_config, run):
+                            if cmd_freed is not None:
+                                removed = (removed or 0) + cmd_freed
+                        
+                        # Calculate freed space - in-process deletes already counted
+                        # their bytes, so only re-scan after external commands
+                        if removed is not None:
+                            freed = removed
+                        else:
+                            size_after = _bloat_paths_size(source_config['expanded_paths'])
+                            freed = size_before - size_after
                         cleaned_total += freed
+                        for p in source_config['expanded_paths']:
+                            _bloat_sizes.pop(p, None)
                         
                         if freed > 0:
                             info('DISK_WATCHDOG', f'Cleaned {source_config["name"]}: freed {format_bytes(freed)}')
@@ -6149,20 +6351,32 @@ class StatsCollector:
             # Sleep for 30 minutes between checks
             time.sleep(1800)
     
-    def get_all_stats(self):
-        """Get all collected statistics"""
+    def get_all_stats(self, shallow=False):
+        """
+        Get all collected statistics
+        
+        Collectors always publish a fresh dict rather than mutating the old one,
+        so the snapshot can hold the live dicts. It is cached until a collector
+        publishes again. With shallow=True that shared snapshot is returned
+        as-is and must be treated as read-only; otherwise each section is copied.
+        """
         with self.lock:
-            return {
-                'containers': dict(self.container_stats),
-                'system': dict(self.system_stats),
-                'xilriws': dict(self.xilriws_stats),
-                'rotom': dict(self.rotom_stats),
-                'koji': dict(self.koji_stats),
-                'reactmap': dict(self.reactmap_stats),
-                'database': dict(self.database_stats),
-                'ports': dict(self.port_status),
-                'services': dict(self.service_status)
-            }
+            if self._snapshot is None:
+                self._snapshot = {
+                    'containers': self.container_stats,
+                    'system': self.system_stats,
+                    'xilriws': self.xilriws_stats,
+                    'rotom': self.rotom_stats,
+                    'koji': self.koji_stats,
+                    'reactmap': self.reactmap_stats,
+                    'database': self.database_stats,
+                    'ports': self.port_status,
+                    'services': self.service_status
+                }
+            snapshot = self._snapshot
+        if shallow:
+            return snapshot
+        return {key: dict(value) for key, value in snapshot.items()}
 
 # Initialize stats collector
 stats_collector = StatsCollector()
@@ -6171,21 +6385,165 @@ stats_collector = StatsCollector()
 # HELPER FUNCTIONS
 # =============================================================================
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Pure function polled with the same few totals (RAM, swap, disk) every request
+@lru_cache(maxsize=1024)
 def format_bytes(bytes_val):
-    """Format bytes to human readable"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_val < 1024:
-            return f"{bytes_val:.1f} {unit}"
-        bytes_val /= 1024
-    return f"{bytes_val:.1f} PB"
+    """Format bytes to human readable string"""
+    magnitude = int(abs(bytes_val))
+    if magnitude < 1024:
+        return f"{bytes_val:.1f} B"
+    # Each unit is 2^10 of the previous - pick it straight from the bit length
+    unit = min((magnitude.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_val / (1 << (unit * 10)):.1f} {_BYTE_UNITS[unit]}"
+
+def _int_before(text, marker):
+    """Integer word directly before marker ("128 rollback segments" -> 128), or None"""
+    idx = text.find(marker)
+    if idx <= 0:
+        return None
+    word = text[:idx].rstrip().rpartition(' ')[2]
+    return int(word) if word.isdigit() else None
+
+def _int_after(text, marker):
+    """Integer word directly after marker and optional colon ("pools: 1" -> 1), or None"""
+    idx = text.find(marker)
+    if idx < 0:
+        return None
+    word = text[idx + len(marker):].lstrip(' :').partition(' ')[0].rstrip('.,')
+    return int(word) if word.isdigit() else None
+
+# connect_ex() results meaning a non-blocking connect is still in flight
+_CONNECT_IN_PROGRESS = {
+    errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK,
+    getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)
+}
+
+def probe_ports(ports, host='127.0.0.1', timeout=1.0):
+    """
+    Check which TCP ports accept connections on host.
+    
+    Starts a non-blocking connect for every port and waits on all of them
+    with select(), so the batch takes at most one timeout instead of one
+    timeout per closed/filtered port.
+    
+    Returns: {port: True/False}
+    """
+    results = {port: False for port in ports}
+    pending = {}
+    try:
+        for port in ports:
+            sock = None
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                rc = sock.connect_ex((host, port))
+            except OSError:
+                if sock:
+                    sock.close()
+                continue
+            if rc in _CONNECT_IN_PROGRESS:
+                pending[sock] = port
+            else:
+                results[port] = rc == 0
+                sock.close()
+        
+        deadline = time.time() + timeout
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            socks = list(pending)
+            # Windows reports refused connects via the exception set
+            _, writable, failed = select.select([], socks, socks, remaining)
+            if not writable and not failed:
+                break
+            for sock in set(writable) | set(failed):
+                port = pending.pop(sock)
+                results[port] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                sock.close()
+    finally:
+        for sock in pending:
+            sock.close()
+    return results
+
+def probe_ports_threaded(ports, host='127.0.0.1', timeout=0.5):
+    """
+    Same as probe_ports(), but with blocking create_connection() calls run in
+    parallel on a thread pool. Used when the select()-based probe fails.
+    
+    Returns: {port: True/False}
+    """
+    def probe(port):
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(16, max(1, len(ports)))) as executor:
+        futures = {executor.submit(probe, port): port for port in ports}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+# A listening socket has state 0A in /proc/net/tcp{,6}
+_TCP_LISTEN = '0A'
+PORT_LISTEN_TTL = 5.0  # seconds
+_port_listen_cache = {}  # port -> (monotonic ts, listening)
+
+def port_listening(port):
+    """
+    True if something listens on TCP port in this network namespace.
+    
+    Reads /proc/net/tcp and tcp6 instead of connecting, so a closed port costs
+    no handshake or timeout; falls back to probe_ports() without /proc.
+    Results are cached for PORT_LISTEN_TTL seconds.
+    """
+    now = time.monotonic()
+    cached = _port_listen_cache.get(port)
+    if cached and now - cached[0] < PORT_LISTEN_TTL:
+        return cached[1]
+    
+    suffix = f':{port:04X}'
+    listening = False
+    found_table = False
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table) as f:
+                next(f, None)  # header
+                found_table = True
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_LISTEN and fields[1].endswith(suffix):
+                        listening = True
+                        break
+        except OSError:
+            continue
+        if listening:
+            break
+    if not found_table:
+        listening = probe_ports([port]).get(port, False)
+    
+    _port_listen_cache[port] = (now, listening)
+    return listening
 
 def get_container_logs(container_name, lines=100):
     """Get logs from a container"""
     if docker_client:
         try:
             container = docker_client.containers.get(container_name)
-            logs = container.logs(tail=lines, timestamps=True).decode('utf-8', errors='ignore')
-            return logs
+            # Decode chunk by chunk so the full raw byte blob is never held
+            # alongside its decoded copy
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+            chunks = [
+                decoder.decode(chunk)
+                for chunk in container.logs(tail=lines, timestamps=True, stream=True, follow=False)
+            ]
+            chunks.append(decoder.decode(b'', final=True))
+            return ''.join(chunks)
         except Exception as e:
             return f"Error: {str(e)}"
     else:
@@ -6207,15 +6565,21 @@ def index():
     """Main dashboard"""
     return render_template('index.html')
 
+# Static assets that are always served fresh, and the headers that force it
+_NO_CACHE_EXTENSIONS = frozenset({'js', 'css'})
+_NO_CACHE_HEADERS = {
+    'Cache-Control': 'no-store, no-cache, must-revalidate, max-age=0',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
+
 @app.route('/static/<path:filename>')
 def static_files(filename):
     """Serve static files with aggressive cache busting for development"""
     response = send_from_directory(str(STATIC_DIR), filename)
     # Force browsers to ALWAYS get fresh JS/CSS during development
-    if filename.endswith(('.js', '.css')):
-        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
+    if filename.rpartition('.')[2] in _NO_CACHE_EXTENSIONS:
+        response.headers.update(_NO_CACHE_HEADERS)
         # Remove ETag to prevent 304 responses
         response.headers.pop('ETag', None)
         # Force response to not be conditional
@@ -6274,6 +6638,20 @@ def api_metrics_history(metric_name):
             'error': str(e)
         })
 
+@lru_cache(maxsize=32)
+def _sparkline_cached(metric_name, points, epoch_second):
+    """Sparkline query memoized per second - epoch_second only keys the cache"""
+    return tuple(shellder_db.get_metric_sparkline(metric_name, points))
+
+def get_sparkline(metric_name, points=20):
+    """
+    Sparkline values for a metric, shared by /api/metrics/current and
+    /api/metrics/sparklines so a dashboard refresh queries SQLite once per metric
+    """
+    if not shellder_db:
+        return []
+    return list(_sparkline_cached(metric_name, points, int(time.time())))
+
 @app.route('/api/metrics/sparklines')
 def api_metrics_sparklines():
     """Get sparkline data for all system metrics"""
@@ -6281,9 +6659,9 @@ def api_metrics_sparklines():
         points = request.args.get('points', 20, type=int)
         
         return jsonify({
-            'cpu': shellder_db.get_metric_sparkline('cpu_percent', points) if shellder_db else [],
-            'memory': shellder_db.get_metric_sparkline('memory_percent', points) if shellder_db else [],
-            'disk': shellder_db.get_metric_sparkline('disk_percent', points) if shellder_db else []
+            'cpu': get_sparkline('cpu_percent', points),
+            'memory': get_sparkline('memory_percent', points),
+            'disk': get_sparkline('disk_percent', points)
         })
     except Exception as e:
         error('METRICS', f'Error getting sparklines: {e}')
@@ -6292,14 +6670,14 @@ def api_metrics_sparklines():
 @app.route('/api/metrics/current')
 def api_metrics_current():
     """Get current system metrics with sparkline data"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     system = stats.get('system', {})
     
     # Get sparklines
     sparklines = {
-        'cpu': shellder_db.get_metric_sparkline('cpu_percent', 20),
-        'memory': shellder_db.get_metric_sparkline('memory_percent', 20),
-        'disk': shellder_db.get_metric_sparkline('disk_percent', 20)
+        'cpu': get_sparkline('cpu_percent', 20),
+        'memory': get_sparkline('memory_percent', 20),
+        'disk': get_sparkline('disk_percent', 20)
     }
     
     return jsonify({
@@ -6347,54 +6725,62 @@ def api_metrics_debug():
                     'now_local': row[1]
                 }
                 
-                # Get count and range for each metric
-                for metric in ['cpu_percent', 'memory_percent', 'disk_percent']:
-                    cursor.execute("""
-                        SELECT 
-                            COUNT(*) as count,
-                            MIN(recorded_at) as oldest,
-                            MAX(recorded_at) as newest,
-                            MIN(metric_value) as min_val,
-                            MAX(metric_value) as max_val,
-                            AVG(metric_value) as avg_val
-                        FROM metrics_history
-                        WHERE metric_name = ?
-                    """, (metric,))
-                    row = cursor.fetchone()
+                metrics = ['cpu_percent', 'memory_percent', 'disk_percent']
+                for metric in metrics:
                     debug_info['metrics'][metric] = {
-                        'count': row[0],
-                        'oldest': row[1],
-                        'newest': row[2],
-                        'min': round(row[3], 2) if row[3] else None,
-                        'max': round(row[4], 2) if row[4] else None,
-                        'avg': round(row[5], 2) if row[5] else None
+                        'count': 0, 'oldest': None, 'newest': None,
+                        'min': None, 'max': None, 'avg': None,
+                        'last_5': [],
+                        'last_24h_query': {'count': 0, 'oldest': None, 'newest': None}
                     }
-                    
-                    # Get last 5 entries
-                    cursor.execute("""
-                        SELECT metric_value, recorded_at
-                        FROM metrics_history
-                        WHERE metric_name = ?
-                        ORDER BY recorded_at DESC
-                        LIMIT 5
-                    """, (metric,))
-                    debug_info['metrics'][metric]['last_5'] = [
-                        {'value': r[0], 'time': r[1]} for r in cursor.fetchall()
-                    ]
-                    
-                    # Test the 24h query
-                    cursor.execute("""
-                        SELECT COUNT(*), MIN(recorded_at), MAX(recorded_at)
+                placeholders = ','.join('?' * len(metrics))
+                
+                # Count and range for all metrics, plus the 24h window, in one pass
+                cursor.execute(f"""
+                    SELECT 
+                        metric_name,
+                        COUNT(*) as count,
+                        MIN(recorded_at) as oldest,
+                        MAX(recorded_at) as newest,
+                        MIN(metric_value) as min_val,
+                        MAX(metric_value) as max_val,
+                        AVG(metric_value) as avg_val,
+                        SUM(recorded_at >= datetime('now', '-1440 minutes')) as count_24h,
+                        MIN(CASE WHEN recorded_at >= datetime('now', '-1440 minutes') THEN recorded_at END) as oldest_24h,
+                        MAX(CASE WHEN recorded_at >= datetime('now', '-1440 minutes') THEN recorded_at END) as newest_24h
+                    FROM metrics_history
+                    WHERE metric_name IN ({placeholders})
+                    GROUP BY metric_name
+                """, metrics)
+                for row in cursor.fetchall():
+                    debug_info['metrics'][row[0]].update({
+                        'count': row[1],
+                        'oldest': row[2],
+                        'newest': row[3],
+                        'min': round(row[4], 2) if row[4] else None,
+                        'max': round(row[5], 2) if row[5] else None,
+                        'avg': round(row[6], 2) if row[6] else None,
+                        'last_24h_query': {
+                            'count': row[7],
+                            'oldest': row[8],
+                            'newest': row[9]
+                        }
+                    })
+                
+                # Last 5 entries per metric
+                cursor.execute(f"""
+                    SELECT metric_name, metric_value, recorded_at
+                    FROM (
+                        SELECT metric_name, metric_value, recorded_at,
+                               ROW_NUMBER() OVER (PARTITION BY metric_name ORDER BY recorded_at DESC) as rn
                         FROM metrics_history
-                        WHERE metric_name = ?
-                          AND recorded_at >= datetime('now', '-1440 minutes')
-                    """, (metric,))
-                    row = cursor.fetchone()
-                    debug_info['metrics'][metric]['last_24h_query'] = {
-                        'count': row[0],
-                        'oldest': row[1],
-                        'newest': row[2]
-                    }
+                        WHERE metric_name IN ({placeholders})
+                    )
+                    WHERE rn <= 5
+                    ORDER BY metric_name, recorded_at DESC
+                """, metrics)
+                for r in cursor.fetchall():
+                    debug_info['metrics'][r[0]]['last_5'].append({'value': r[1], 'time': r[2]})
                 
             except Exception as e:
                 debug_info['error'] = str(e)
@@ -6407,14 +6793,306 @@ def api_metrics_debug():
 # DEBUG ENDPOINTS (AI-FRIENDLY COMPREHENSIVE LOGGING)
 # =============================================================================
 
-# Store client-side debug logs
-client_debug_logs = []
+def _tail_offset(f, n, block=65536, end=None):
+    """
+    Byte offset where the last n lines of binary file f start (ending at `end`).
+    
+    Scans backwards in `block`-sized chunks counting newlines, so only the
+    tail region is read and nothing is kept in memory.
+    """
+    pos = f.seek(0, os.SEEK_END) if end is None else end
+    # A newline right at the end terminates the last line rather than starting one
+    if pos > 0:
+        f.seek(pos - 1)
+        if f.read(1) == b'\n':
+            pos -= 1
+    remaining = n
+    while pos > 0:
+        step = min(block, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        idx = len(chunk)
+        while True:
+            idx = chunk.rfind(b'\n', 0, idx)
+            if idx < 0:
+                break
+            remaining -= 1
+            if remaining == 0:
+                return pos + idx + 1
+    return 0
+
+def _tail_iter(path, n, block=65536, end=None):
+    """
+    Yield the last n lines of a text file in order (ending at byte offset
+    `end`, default EOF).
+    
+    The start of the tail is found by reading backwards, then lines are
+    streamed forwards one at a time - memory stays constant regardless of n.
+    """
+    if n <= 0:
+        return
+    with open(path, 'rb') as f:
+        if end is None:
+            end = f.seek(0, os.SEEK_END)
+        pos = _tail_offset(f, n, block, end)
+        f.seek(pos)
+        while pos < end:
+            raw = f.readline(end - pos)
+            if not raw:
+                break
+            pos += len(raw)
+            yield raw.decode('utf-8', errors='ignore').rstrip('\r\n')
+
+def _tail(path, n, block=65536, end=None):
+    """Last n lines of a text file as a list (see _tail_iter)"""
+    return list(_tail_iter(path, n, block, end))
+
+# path -> (inode, bytes counted, newlines in those bytes) for _count_lines
+_line_counts = {}
+
+def _count_lines(path, block=1 << 20):
+    """
+    Count lines in a file by scanning raw blocks (no decoding, constant memory).
+    
+    The newline count is remembered per path, so a log that only grew since the
+    last call is scanned from where the previous count stopped. Rotation (new
+    inode) or truncation starts over.
+    """
+    key = str(path)
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        inode, counted, newlines = _line_counts.get(key, (None, 0, 0))
+        if inode != st.st_ino or counted > st.st_size:
+            counted, newlines = 0, 0
+        f.seek(counted)
+        remaining = st.st_size - counted
+        while remaining > 0:
+            chunk = f.read(min(block, remaining))
+            if not chunk:
+                break
+            newlines += chunk.count(b'\n')
+            counted += len(chunk)
+            remaining -= len(chunk)
+    _line_counts[key] = (st.st_ino, counted, newlines)
+    return newlines + 1
+
+class LogDirWatcher:
+    """
+    A single inotify watch on a log directory, shared by every streaming client.
+    
+    Each subscriber gets a Queue that is signalled whenever its file is
+    modified, created or moved into place, so idle streams block instead of
+    polling. Without inotify_simple (or on non-Linux) subscribe() returns None
+    and callers fall back to polling.
+    """
+    
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.available = INOTIFY_AVAILABLE
+        self._subscribers = {}  # Queue -> watched filename
+        self._lock = threading.Lock()
+        self._inotify = None
+    
+    def subscribe(self, filename):
+        """Get a Queue signalled on changes to filename, or None if inotify is unavailable"""
+        if not self.available:
+            return None
+        with self._lock:
+            if self._inotify is None:
+                try:
+                    self._inotify = INotify()
+                    self._inotify.add_watch(
+                        str(self.directory),
+                        inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO
+                    )
+                except Exception as e:
+                    warn('DEBUG', f'inotify unavailable, log streams will poll: {e}')
+                    self.available = False
+                    return None
+                threading.Thread(target=self._run, daemon=True).start()
+            changes = queue.Queue(maxsize=1)
+            self._subscribers[changes] = filename
+            return changes
+    
+    def unsubscribe(self, changes):
+        with self._lock:
+            self._subscribers.pop(changes, None)
+    
+    def _run(self):
+        """Fan kernel change events out to the matching subscribers"""
+        while True:
+            try:
+                if ASYNC_MODE == 'eventlet':
+                    # Park this green thread on the hub until the fd is readable,
+                    # then read without inotify_simple's blocking poll()
+                    trampoline(self._inotify.fileno(), read=True)
+                    events = self._inotify.read(timeout=0)
+                else:
+                    events = self._inotify.read()
+            except Exception as e:
+                warn('DEBUG', f'inotify watcher stopped, log streams will poll: {e}')
+                self.available = False
+                return
+            
+            changed = {event.name for event in events}
+            with self._lock:
+                targets = [q for q, name in self._subscribers.items() if name in changed]
+            for changes in targets:
+                try:
+                    changes.put_nowait(True)
+                except queue.Full:
+                    pass  # Already signalled and not consumed yet
+
+log_watcher = LogDirWatcher(LOG_DIR)
+
+def _follow_log(path, offset=0, interval=1.0, heartbeat=5.0, progress=None):
+    """
+    Generator yielding lines appended to a log file after byte `offset`, like tail -f.
+    
+    The file stays open and each wake-up reads only the bytes added since the
+    last one. Yields None after a check that found nothing new (for heartbeats).
+    Truncation or rotation restarts from the beginning.
+    
+    Between checks it blocks on an inotify change signal for up to `heartbeat`
+    seconds when the file lives in LOG_DIR, otherwise it sleeps `interval`.
+    
+    If `progress` is a dict, progress['offset'] is set to the byte offset just
+    past each line before that line is yielded.
+    """
+    path = Path(path)
+    changes = log_watcher.subscribe(path.name) if path.parent == log_watcher.directory else None
+    
+    def wait():
+        if changes is not None and log_watcher.available:
+            try:
+                changes.get(timeout=heartbeat)
+            except queue.Empty:
+                pass
+        else:
+            time.sleep(interval)
+    
+    fh = None
+    pending = b''
+    consumed = offset  # Byte offset where `pending` starts
+    try:
+        while True:
+            if fh is None:
+                try:
+                    fh = open(path, 'rb')
+                    fh.seek(offset)
+                    consumed = offset
+                except OSError:
+                    fh = None
+                    yield None
+                    wait()
+                    continue
+            
+            # fstat on the open handle tells us whether anything was appended;
+            # only read when it grew
+            own = os.fstat(fh.fileno())
+            position = fh.tell()
+            if own.st_size > position:
+                data = fh.read(own.st_size - position)
+                # Hold back a trailing partial line until its newline arrives
+                *lines, pending = (pending + data).split(b'\n')
+                for line in lines:
+                    consumed += len(line) + 1
+                    if progress is not None:
+                        progress['offset'] = consumed
+                    yield line.decode('utf-8', errors='ignore')
+                continue
+            
+            try:
+                st = os.stat(path)
+                rotated = st.st_ino != own.st_ino or own.st_size < position
+            except OSError:
+                rotated = True
+            if rotated:
+                fh.close()
+                fh = None
+                offset = 0
+                pending = b''
+                continue
+            
+            yield None
+            wait()
+    finally:
+        if fh:
+            fh.close()
+        if changes is not None:
+            log_watcher.unsubscribe(changes)
+
+class LogBroadcaster:
+    """
+    Follows one log file on a single background thread and fans every new line
+    out to all subscribers, so N streaming clients cost one reader, not N.
+    
+    The thread starts with the first subscriber and exits once the last one
+    has gone. A subscriber too slow to drain its queue misses lines rather than
+    holding up everyone else.
+    """
+    
+    def __init__(self, path, queue_size=1000):
+        self.path = Path(path)
+        self.queue_size = queue_size
+        self.offset = 0  # Byte offset just past the last line fanned out
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def subscribe(self):
+        """
+        Register for new lines.
+        
+        Returns: (Queue of lines, byte offset) - the queue receives every line
+        after that offset, so the caller can tail the file up to it for context.
+        """
+        with self._lock:
+            if self._thread is None:
+                try:
+                    self.offset = self.path.stat().st_size
+                except OSError:
+                    self.offset = 0
+                self._thread = threading.Thread(target=self._run, args=(self.offset,), daemon=True)
+                self._thread.start()
+            lines = queue.Queue(maxsize=self.queue_size)
+            self._subscribers.add(lines)
+            return lines, self.offset
+    
+    def unsubscribe(self, lines):
+        with self._lock:
+            self._subscribers.discard(lines)
+    
+    def _run(self, offset):
+        progress = {'offset': offset}
+        follow = _follow_log(self.path, offset, interval=0.5, progress=progress)
+        try:
+            for line in follow:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                    if line is None:
+                        continue
+                    self.offset = progress['offset']
+                    for lines in self._subscribers:
+                        try:
+                            lines.put_nowait(line)
+                        except queue.Full:
+                            pass
+        finally:
+            follow.close()
+
+debuglog_broadcaster = LogBroadcaster(LOG_DIR / 'debuglog.txt')
+
+# Store client-side debug logs (oldest dropped automatically)
 MAX_CLIENT_LOGS = 100
+client_debug_logs = deque(maxlen=MAX_CLIENT_LOGS)
 
 @app.route('/api/debug/client-logs', methods=['POST'])
 def api_debug_client_logs():
     """Receive debug logs from client-side JavaScript and write to unified debuglog.txt"""
-    global client_debug_logs
     try:
         # Handle both application/json and text/plain content types (old JS compatibility)
         if request.is_json:
@@ -6424,21 +7102,30 @@ def api_debug_client_logs():
             import json
             data = json.loads(request.get_data(as_text=True))
         
-        # Log to unified debug log (with client IP for version tracking)
-        log_client_logs(data, client_ip=request.remote_addr)
+        ip = request.remote_addr
+        ua = request.headers.get('User-Agent', 'unknown')
+        now_iso = datetime.now().isoformat()
         
-        client_debug_logs.append({
-            'received_at': datetime.now().isoformat(),
-            'client_ip': request.remote_addr,
-            'user_agent': request.headers.get('User-Agent', 'unknown'),
-            'data': data
-        })
-        # Keep only last N logs
-        if len(client_debug_logs) > MAX_CLIENT_LOGS:
-            client_debug_logs = client_debug_logs[-MAX_CLIENT_LOGS:]
+        # Log to unified debug log (with client IP for version tracking)
+        log_client_logs(data, client_ip=ip)
+        
+        # One bundle carries many entries - store them in a single extend
+        all_logs = data.get('allLogs')
+        if isinstance(all_logs, list):
+            client_debug_logs.extend([
+                {'received_at': now_iso, 'client_ip': ip, 'user_agent': ua, 'data': item}
+                for item in all_logs
+            ])
+        else:
+            client_debug_logs.append({
+                'received_at': now_iso,
+                'client_ip': ip,
+                'user_agent': ua,
+                'data': data
+            })
         
-        info('API', f'Received {len(data.get("allLogs", []))} client logs', {
-            'client_ip': request.remote_addr
+        info('API', f'Received {len(all_logs) if isinstance(all_logs, list) else 0} client logs', {
+            'client_ip': ip
         })
         
         return jsonify({'success': True, 'logged': len(client_debug_logs)})
@@ -6451,84 +7138,213 @@ def api_debug_get_client_logs():
     """Retrieve stored client debug logs"""
     return jsonify({
         'count': len(client_debug_logs),
-        'logs': client_debug_logs
+        'logs': list(client_debug_logs)
     })
 
-@app.route('/api/debug/live')
-def api_debug_live():
-    """Get recent debug log entries for live viewing on dashboard"""
-    count = request.args.get('count', 50, type=int)
-    count = min(count, 200)  # Cap at 200 entries
-    
-    logs = get_recent_logs(count)
-    
+# Read-only git queries get a small fixed environment instead of a copy of ours:
+# no credential prompts, and no optional index lock/refresh on status-style reads.
+# Pulls keep the full environment so SSH agents and credential helpers still work.
+_GIT_ENV = {
+    'PATH': os.environ.get('PATH', os.defpath),
+    'HOME': os.environ.get('HOME', ''),
+    'GIT_TERMINAL_PROMPT': '0',
+    'GIT_OPTIONAL_LOCKS': '0'
+}
+_AEGIS_ROOT_STR = str(AEGIS_ROOT)
+
+@lru_cache(maxsize=None)
+def _resolve_exe(name):
+    """Absolute path of a helper binary on PATH (looked up once), else name"""
+    return shutil.which(name) or name
+
+def _run_quick(argv, *, timeout=10, env=None):
+    """
+    Run a short-lived helper command (git, docker, journalctl) from an argv list.
+    
+    CPython only uses posix_spawn instead of fork + exec when the executable
+    is an absolute path, close_fds is off and no cwd is set - so the binary is
+    resolved here and callers pass no cwd (git gets -C instead). Our own
+    descriptors are non-inheritable already, so close_fds=False is safe.
+    Not for user-supplied commands - the exec endpoint keeps the defaults.
+    """
+    argv = [_resolve_exe(argv[0]), *argv[1:]]
+    return subprocess.run(argv, capture_output=True, text=True, timeout=timeout,
+                          env=env, close_fds=False)
+
+def _git_argv(*args):
+    """git argv run against AEGIS_ROOT via -C, so no cwd is needed"""
+    return [_resolve_exe('git'), '-C', _AEGIS_ROOT_STR, *args]
+
+def _git(*args, timeout=10):
+    """Run a read-only git command in AEGIS_ROOT and return the CompletedProcess"""
+    return _run_quick(_git_argv(*args), env=_GIT_ENV, timeout=timeout)
+
+_git_repo = None
+
+def _get_git_repo():
+    """Shared pygit2 Repository for AEGIS_ROOT, or None to fall back to the git CLI"""
+    global _git_repo
+    if _git_repo is None and PYGIT2_AVAILABLE:
+        try:
+            _git_repo = pygit2.Repository(str(AEGIS_ROOT))
+        except Exception:
+            return None
+    return _git_repo
+
+def _git_commit_date(commit):
+    """A pygit2 commit's committer date in git's %ci format"""
+    tz = timezone(timedelta(minutes=commit.commit_time_offset))
+    return datetime.fromtimestamp(commit.commit_time, tz).strftime('%Y-%m-%d %H:%M:%S %z')
+
+def _git_head_changes(repo):
+    """Short HEAD hash and the files HEAD changed relative to its first parent"""
+    commit = repo[repo.head.target]
+    changed_files = []
+    if commit.parents:
+        diff = repo.diff(commit.parents[0], commit)
+        changed_files = [delta.new_file.path for delta in diff.deltas]
+    return str(commit.id)[:7], changed_files
+
+def _compute_git_info():
+    """Short commit hash and commit date of AEGIS_ROOT's HEAD"""
+    git_info = {'commit': 'unknown', 'commit_date': 'unknown'}
+    try:
+        repo = _get_git_repo()
+        if repo is not None:
+            commit = repo[repo.head.target]
+            git_info = {'commit': str(commit.id)[:7], 'commit_date': _git_commit_date(commit)}
+        else:
+            result = _git('log', '-1', '--format=%h%n%ci', 'HEAD', timeout=5)
+            if result.returncode == 0:
+                commit, _, commit_date = result.stdout.strip().partition('\n')
+                git_info = {'commit': commit, 'commit_date': commit_date}
+    except Exception:
+        pass
+    return git_info
+
+# HEAD only moves when we pull (every pull endpoint refreshes it), so the
+# live-polling endpoint serves this instead of asking git on every request.
+_current_git_info = None
+
+def _refresh_git_info():
+    """Recompute the cached HEAD info (after a pull)"""
+    global _current_git_info
+    _current_git_info = _compute_git_info()
+    return _current_git_info
+
+def _get_git_info():
+    """Cached HEAD info, computed on first use"""
+    return _current_git_info or _refresh_git_info()
+
+# debug_logger's padded "[LEVEL]" tag -> level reported to the dashboard
+_LOG_LEVEL_PATTERN = re.compile(r'\[(ERROR|FATAL|WARN |INFO |TRACE|DEBUG)\]')
+_LOG_LEVEL_MAP = {
+    'ERROR': 'ERROR', 'FATAL': 'ERROR', 'WARN ': 'WARN',
+    'INFO ': 'INFO', 'TRACE': 'TRACE', 'DEBUG': 'DEBUG',
+}
+
+# Fixed for the life of the process (a restart re-execs and recomputes them)
+_STATIC_LIVE_FIELDS = {
+    'version': SHELLDER_VERSION,
+    'build': SHELLDER_BUILD,
+    'log_path': get_log_path(),
+    'pid': os.getpid()
+}
+
+@app.route('/api/debug/live')
+def api_debug_live():
+    """Get recent debug log entries for live viewing on dashboard"""
+    count = request.args.get('count', 50, type=int)
+    count = min(count, 200)  # Cap at 200 entries
+    
+    logs = get_recent_logs(count)
+    
     # Parse log entries to extract level and category for filtering/coloring
     parsed = []
     for entry in logs:
-        level = 'DEBUG'
-        if '[ERROR]' in entry or '[FATAL]' in entry:
-            level = 'ERROR'
-        elif '[WARN ]' in entry:
-            level = 'WARN'
-        elif '[INFO ]' in entry:
-            level = 'INFO'
-        elif '[TRACE]' in entry:
-            level = 'TRACE'
-        
+        m = _LOG_LEVEL_PATTERN.search(entry)
         parsed.append({
             'raw': entry,
-            'level': level
+            'level': _LOG_LEVEL_MAP[m.group(1)] if m else 'DEBUG'
         })
     
     # Get git status
-    git_info = {}
-    try:
-        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], 
-                               capture_output=True, text=True, timeout=5, cwd=str(AEGIS_ROOT))
-        git_info['commit'] = result.stdout.strip() if result.returncode == 0 else 'unknown'
-        
-        result = subprocess.run(['git', 'log', '-1', '--format=%ci'], 
-                               capture_output=True, text=True, timeout=5, cwd=str(AEGIS_ROOT))
-        git_info['commit_date'] = result.stdout.strip() if result.returncode == 0 else 'unknown'
-    except:
-        git_info = {'commit': 'unknown', 'commit_date': 'unknown'}
+    git_info = _get_git_info()
     
     return jsonify({
-        'version': SHELLDER_VERSION,
-        'build': SHELLDER_BUILD,
+        **_STATIC_LIVE_FIELDS,
         'git': git_info,
         'count': len(parsed),
         'logs': parsed,
-        'log_path': get_log_path(),
-        'uptime_seconds': time.time() - _start_time if '_start_time' in dir() else 0,
-        'pid': os.getpid()
+        'uptime_seconds': time.time() - _start_time
     })
 
+# Stash, pull, then report the new commit and changed files - run as one
+# shell invocation instead of four separate git spawns. Exits with pull's status.
+# `git show --name-only --pretty=format:%h` prints the short hash on the first
+# line and the files HEAD touched after it.
+# With pygit2 only the stash and pull are shelled out (network/auth stay with git).
+_GIT_STASH_PULL_SCRIPT = 'git stash -q >/dev/null 2>&1; git pull 2>&1'
+_GIT_PULL_SCRIPT = (
+    _GIT_STASH_PULL_SCRIPT + '; rc=$?; '
+    'echo ---SEP---; git show --name-only --pretty=format:%h HEAD; '
+    'exit $rc'
+)
+
+def _git_pull():
+    """
+    Stash local changes and pull AEGIS_ROOT.
+    
+    Returns: (success, output, new_commit, changed_files)
+    """
+    repo = _get_git_repo()
+    if repo is not None:
+        result = subprocess.run(_GIT_STASH_PULL_SCRIPT, shell=True, capture_output=True, text=True,
+                                cwd=_AEGIS_ROOT_STR, timeout=45)
+        try:
+            new_commit, changed_files = _git_head_changes(repo)
+        except Exception:
+            new_commit, changed_files = '', []
+        output = result.stdout
+    else:
+        result = subprocess.run(_GIT_PULL_SCRIPT, shell=True, capture_output=True, text=True,
+                                cwd=_AEGIS_ROOT_STR, timeout=45)
+        output, _, rest = result.stdout.partition('---SEP---\n')
+        new_commit, *changed_files = rest.splitlines() or ['']
+        new_commit = new_commit.strip()
+        changed_files = [f for f in changed_files if f]
+    
+    if result.returncode == 0:
+        _refresh_git_info()
+    return result.returncode == 0, output, new_commit, changed_files
+
+# Double-clicks on pull buttons coalesce: a request that arrives while a pull is
+# running waits for it, and repeats within the TTL reuse the last response.
+_PULL_COALESCE_TTL = 2  # seconds
+_pull_lock = threading.Lock()
+_pull_results = {}  # endpoint -> (finished_at, payload)
+
+def _coalesced_pull(endpoint, run):
+    """Return run()'s payload, shared with concurrent or rapid-repeat calls to endpoint"""
+    with _pull_lock:
+        cached = _pull_results.get(endpoint)
+        if cached and time.time() - cached[0] < _PULL_COALESCE_TTL:
+            info('DEBUG', f'Reusing {endpoint} result from {time.time() - cached[0]:.1f}s ago')
+            return cached[1]
+        payload = run()
+        _pull_results[endpoint] = (time.time(), payload)
+        return payload
+
 @app.route('/api/debug/git-pull', methods=['POST'])
 def api_debug_git_pull():
     """Pull latest code from GitHub - for AI live debugging"""
     info('DEBUG', '🔄 Git pull requested from dashboard')
-    
+    return jsonify(_coalesced_pull('git-pull', _run_git_pull))
+
+def _run_git_pull():
+    """Body of /api/debug/git-pull, returning the response payload"""
     try:
-        # Stash any local changes
-        subprocess.run(['git', 'stash'], capture_output=True, cwd=str(AEGIS_ROOT), timeout=10)
-        
-        # Pull latest
-        result = subprocess.run(['git', 'pull'], capture_output=True, text=True, 
-                               cwd=str(AEGIS_ROOT), timeout=30)
-        
-        output = result.stdout + result.stderr
-        success = result.returncode == 0
-        
-        # Get new commit info
-        commit_result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], 
-                                       capture_output=True, text=True, cwd=str(AEGIS_ROOT))
-        new_commit = commit_result.stdout.strip()
-        
-        # Check what files changed
-        diff_result = subprocess.run(['git', 'diff', '--name-only', 'HEAD~1'], 
-                                    capture_output=True, text=True, cwd=str(AEGIS_ROOT))
-        changed_files = diff_result.stdout.strip().split('\n') if diff_result.stdout.strip() else []
+        success, output, new_commit, changed_files = _git_pull()
         
         # Fix ownership of changed files to prevent root-locked files
         if success and changed_files:
@@ -6544,16 +7360,16 @@ def api_debug_git_pull():
             'changed_files': changed_files[:10]
         })
         
-        return jsonify({
+        return {
             'success': success,
             'output': output,
             'new_commit': new_commit,
             'changed_files': changed_files,
             'needs_restart': any('shellder_service.py' in f or 'script.js' in f for f in changed_files)
-        })
+        }
     except Exception as e:
         error('DEBUG', f'Git pull failed: {e}')
-        return jsonify({'success': False, 'error': str(e)})
+        return {'success': False, 'error': str(e)}
 
 @app.route('/api/debug/restart', methods=['POST'])
 def api_debug_restart():
@@ -6577,25 +7393,18 @@ def api_debug_restart():
 def api_debug_pull_and_restart():
     """Pull from GitHub and restart - one-click update for AI debugging"""
     info('DEBUG', '🚀 Pull and restart requested from dashboard')
-    
+    return jsonify(_coalesced_pull('pull-and-restart', _run_pull_and_restart))
+
+def _run_pull_and_restart():
+    """Body of /api/debug/pull-and-restart, returning the response payload"""
     try:
         # First pull
-        subprocess.run(['git', 'stash'], capture_output=True, cwd=str(AEGIS_ROOT), timeout=10)
-        result = subprocess.run(['git', 'pull'], capture_output=True, text=True, 
-                               cwd=str(AEGIS_ROOT), timeout=30)
-        
-        if result.returncode != 0:
-            return jsonify({'success': False, 'error': 'Git pull failed', 'output': result.stderr})
+        success, output, new_commit, changed_files = _git_pull()
         
-        # Get commit info
-        commit_result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], 
-                                       capture_output=True, text=True, cwd=str(AEGIS_ROOT))
-        new_commit = commit_result.stdout.strip()
+        if not success:
+            return {'success': False, 'error': 'Git pull failed', 'output': output}
         
         # Fix ownership of changed files to prevent root-locked files
-        diff_result = subprocess.run(['git', 'diff', '--name-only', 'HEAD~1'], 
-                                    capture_output=True, text=True, cwd=str(AEGIS_ROOT))
-        changed_files = diff_result.stdout.strip().split('\n') if diff_result.stdout.strip() else []
         for changed_file in changed_files:
             file_path = AEGIS_ROOT / changed_file
             if file_path.exists():
@@ -6609,18 +7418,36 @@ def api_debug_pull_and_restart():
         
         threading.Thread(target=delayed_restart, daemon=True).start()
         
-        return jsonify({
+        return {
             'success': True,
             'new_commit': new_commit,
             'message': 'Pulled and restarting. Refresh page in 3-5 seconds.'
-        })
+        }
     except Exception as e:
         error('DEBUG', f'Pull and restart failed: {e}')
-        return jsonify({'success': False, 'error': str(e)})
+        return {'success': False, 'error': str(e)}
+
+# Docker daemon version is fixed for the life of the client - fetched once
+_docker_version = None
+
+def _get_docker_version():
+    """docker_client.version(), cached after the first successful call"""
+    global _docker_version
+    if _docker_version is None and docker_client:
+        _docker_version = docker_client.version()
+    return _docker_version
+
+@lru_cache(maxsize=16)
+def _path_exists(path, bucket):
+    """path.exists(), memoized per `bucket` (a coarse time slot) so results expire"""
+    return path.exists()
+
+_PATH_EXISTS_TTL = 5  # seconds
 
 @app.route('/api/debug/server-state')
 def api_debug_server_state():
     """Get comprehensive server state for debugging"""
+    bucket = int(time.monotonic() // _PATH_EXISTS_TTL)
     return jsonify({
         'timestamp': datetime.now().isoformat(),
         'config': {
@@ -6637,16 +7464,16 @@ def api_debug_server_state():
         },
         'docker': {
             'client_connected': docker_client is not None,
-            'version': docker_client.version() if docker_client else None
+            'version': _get_docker_version()
         },
         'paths': {
-            'aegis_root_exists': AEGIS_ROOT.exists(),
-            'shellder_dir_exists': SHELLDER_DIR.exists(),
-            'data_dir_exists': DATA_DIR.exists(),
-            'log_dir_exists': LOG_DIR.exists(),
-            'templates_dir_exists': TEMPLATES_DIR.exists(),
-            'static_dir_exists': STATIC_DIR.exists(),
-            'shellder_db_exists': SHELLDER_DB.exists()
+            'aegis_root_exists': _path_exists(AEGIS_ROOT, bucket),
+            'shellder_dir_exists': _path_exists(SHELLDER_DIR, bucket),
+            'data_dir_exists': _path_exists(DATA_DIR, bucket),
+            'log_dir_exists': _path_exists(LOG_DIR, bucket),
+            'templates_dir_exists': _path_exists(TEMPLATES_DIR, bucket),
+            'static_dir_exists': _path_exists(STATIC_DIR, bucket),
+            'shellder_db_exists': _path_exists(SHELLDER_DB, bucket)
         },
         'stats_collector': {
             'running': stats_collector.running if stats_collector else False,
@@ -6679,13 +7506,11 @@ def api_debug_logs():
     # Main debug log (unified)
     debug_log = SHELLDER_DIR / 'debuglog.txt'
     if debug_log.exists():
-        with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-            logs['debuglog'] = f.read().split('\n')[-lines:]
+        logs['debuglog'] = _tail(debug_log, lines)
     
     # Shellder log
     if SHELLDER_LOG.exists():
-        with open(SHELLDER_LOG, 'r') as f:
-            logs['shellder'] = f.read().split('\n')[-lines:]
+        logs['shellder'] = _tail(SHELLDER_LOG, lines)
     
     return jsonify(logs)
 
@@ -6718,29 +7543,42 @@ def api_debug_debuglog():
             return jsonify({'error': f'Could not create debuglog.txt: {e}', 'path': str(debug_log)}), 500
     
     try:
-        with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        log_lines = content.split('\n')
-        
-        if format_type == 'json':
-            return jsonify({
-                'path': str(debug_log),
-                'total_lines': len(log_lines),
-                'returned_lines': min(lines, len(log_lines)),
-                'size_bytes': len(content),
-                'lines': log_lines[-lines:]
-            })
-        else:
-            # Return as plain text
-            return Response(
-                '\n'.join(log_lines[-lines:]),
-                mimetype='text/plain'
-            )
+        if format_type != 'json':
+            # Plain text only needs the tail - stream it line by line
+            def stream_text():
+                first = True
+                for line in _tail_iter(debug_log, lines):
+                    if not first:
+                        yield '\n'
+                    first = False
+                    yield line
+            
+            return Response(stream_with_context(stream_text()), mimetype='text/plain')
+        
+        total_lines = _count_lines(debug_log)
+        size_bytes = debug_log.stat().st_size
+        
+        def stream_json():
+            # Hand-assembled envelope so the tail is never joined in memory
+            yield '{"path": %s, "total_lines": %d, "size_bytes": %d, "lines": [' % (
+                json.dumps(str(debug_log)), total_lines, size_bytes)
+            returned = 0
+            for line in _tail_iter(debug_log, lines):
+                yield (', ' if returned else '') + json.dumps(line)
+                returned += 1
+            yield '], "returned_lines": %d}' % returned
+        
+        return Response(stream_with_context(stream_json()), mimetype='application/json')
     except Exception as e:
         error('API', f'Failed to read debuglog: {e}', exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+# URL prefix of an nginx `internal` location aliased to LOG_DIR (nginx-setup.sh
+# creates /internal/shellder-logs/). When set, log downloads are answered with
+# X-Accel-Redirect so nginx sends the file itself instead of this worker.
+# Leave unset when the dashboard is reached directly on SHELLDER_PORT.
+ACCEL_REDIRECT_PREFIX = os.environ.get('SHELLDER_ACCEL_REDIRECT', '').rstrip('/')
+
 @app.route('/api/debug/debuglog/download')
 def api_debug_debuglog_download():
     """Download the full debuglog.txt file"""
@@ -6750,11 +7588,19 @@ def api_debug_debuglog_download():
         return jsonify({'error': 'debuglog.txt not found', 'path': str(debug_log)}), 404
     
     info('API', 'Debug log download requested', {'client': request.remote_addr})
+    download_name = f'shellder-debug-{datetime.now().strftime("%Y%m%d-%H%M%S")}.txt'
+    
+    if ACCEL_REDIRECT_PREFIX:
+        return Response('', mimetype='text/plain', headers={
+            'X-Accel-Redirect': f'{ACCEL_REDIRECT_PREFIX}/debuglog.txt',
+            'Content-Disposition': f'attachment; filename={download_name}'
+        })
+    
     return send_from_directory(
         LOG_DIR,
         'debuglog.txt',
         as_attachment=True,
-        download_name=f'shellder-debug-{datetime.now().strftime("%Y%m%d-%H%M%S")}.txt'
+        download_name=download_name
     )
 
 @app.route('/api/debug/recent')
@@ -6766,6 +7612,16 @@ def api_debug_recent():
         'logs': get_recent_logs(count)
     })
 
+# Only the log line needs escaping - the SSE envelope around it is fixed text,
+# so encode just the string with one reused encoder instead of a dict per line
+_json_encode_str = json.JSONEncoder(ensure_ascii=False).encode
+
+def _sse_log_event(line):
+    """SSE 'log' event for one debug log line"""
+    return f'data: {{"type": "log", "line": {_json_encode_str(line.rstrip())}}}\n\n'
+
+STREAM_HEARTBEAT = 5  # seconds between SSE heartbeats on an idle log
+
 @app.route('/api/debug/stream')
 def api_debug_stream():
     """
@@ -6776,61 +7632,32 @@ def api_debug_stream():
     This streams all new log entries in real-time for AI debugging.
     """
     def generate():
-        import time
-        
         # Send initial connection message
         yield f"data: {{\"type\": \"connected\", \"time\": \"{datetime.now().isoformat()}\", \"port\": {SHELLDER_PORT}}}\n\n"
         
-        # Track last position in log file
         debug_log = LOG_DIR / 'debuglog.txt'
-        last_size = debug_log.stat().st_size if debug_log.exists() else 0
-        last_lines_sent = 0
-        
-        # Send last 50 lines as context
-        if debug_log.exists():
-            try:
-                with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    for line in lines[-50:]:
-                        yield f"data: {json.dumps({'type': 'log', 'line': line.rstrip()})}\n\n"
-                    last_lines_sent = len(lines)
-            except:
-                pass
-        
-        yield f"data: {{\"type\": \"ready\", \"message\": \"Streaming live logs...\"}}\n\n"
-        
-        # Stream new entries
-        while True:
-            try:
-                if debug_log.exists():
-                    current_size = debug_log.stat().st_size
-                    
-                    if current_size > last_size:
-                        with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
-                            # Send only new lines
-                            new_lines = lines[last_lines_sent:]
-                            for line in new_lines:
-                                yield f"data: {json.dumps({'type': 'log', 'line': line.rstrip()})}\n\n"
-                            last_lines_sent = len(lines)
-                        last_size = current_size
-                    elif current_size < last_size:
-                        # File was truncated/rotated
-                        last_size = 0
-                        last_lines_sent = 0
-                
-                # Also stream from memory buffer (catches logs before file write)
-                recent = get_recent_logs(5)
-                # Heartbeat every 5 seconds
-                yield f"data: {{\"type\": \"heartbeat\", \"time\": \"{datetime.now().isoformat()}\"}}\n\n"
-                
-                time.sleep(1)  # Check every second
-                
-            except GeneratorExit:
-                break
-            except Exception as e:
-                yield f"data: {{\"type\": \"error\", \"message\": \"{str(e)}\"}}\n\n"
-                time.sleep(5)
+        # New lines come from the shared follower; `offset` is where they start
+        lines, offset = debuglog_broadcaster.subscribe()
+        try:
+            # Send last 50 lines as context
+            if debug_log.exists():
+                try:
+                    for line in _tail(debug_log, 50, end=offset):
+                        yield _sse_log_event(line)
+                except:
+                    pass
+            
+            yield f"data: {{\"type\": \"ready\", \"message\": \"Streaming live logs...\"}}\n\n"
+            
+            while True:
+                try:
+                    line = lines.get(timeout=STREAM_HEARTBEAT)
+                except queue.Empty:
+                    yield f"data: {{\"type\": \"heartbeat\", \"time\": \"{datetime.now().isoformat()}\"}}\n\n"
+                    continue
+                yield _sse_log_event(line)
+        finally:
+            debuglog_broadcaster.unsubscribe(lines)
     
     return Response(
         generate(),
@@ -6852,46 +7679,29 @@ def api_debug_tail():
     Streams raw log lines without JSON wrapping.
     """
     def generate():
-        import time
-        
         debug_log = LOG_DIR / 'debuglog.txt'
-        last_lines_sent = 0
-        
-        yield f"=== Shellder Debug Stream @ {datetime.now().isoformat()} ===\n"
-        yield f"=== Port: {SHELLDER_PORT} | Log: {debug_log} ===\n\n"
-        
-        # Send last 100 lines as context
-        if debug_log.exists():
-            try:
-                with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    for line in lines[-100:]:
-                        yield line
-                    last_lines_sent = len(lines)
-            except:
-                pass
-        
-        yield "\n=== LIVE STREAM STARTED ===\n\n"
-        
-        while True:
-            try:
-                if debug_log.exists():
-                    with open(debug_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                        if len(lines) > last_lines_sent:
-                            for line in lines[last_lines_sent:]:
-                                yield line
-                            last_lines_sent = len(lines)
-                        elif len(lines) < last_lines_sent:
-                            # File rotated
-                            last_lines_sent = 0
-                
-                time.sleep(0.5)
-                
-            except GeneratorExit:
-                break
-            except:
-                time.sleep(2)
+        lines, offset = debuglog_broadcaster.subscribe()
+        try:
+            yield f"=== Shellder Debug Stream @ {datetime.now().isoformat()} ===\n"
+            yield f"=== Port: {SHELLDER_PORT} | Log: {debug_log} ===\n\n"
+            
+            # Send last 100 lines as context
+            if debug_log.exists():
+                try:
+                    for line in _tail(debug_log, 100, end=offset):
+                        yield line + '\n'
+                except:
+                    pass
+            
+            yield "\n=== LIVE STREAM STARTED ===\n\n"
+            
+            while True:
+                try:
+                    yield lines.get(timeout=STREAM_HEARTBEAT) + '\n'
+                except queue.Empty:
+                    pass
+        finally:
+            debuglog_broadcaster.unsubscribe(lines)
     
     return Response(
         generate(),
@@ -6906,8 +7716,7 @@ def api_debug_tail():
 @app.route('/api/debug/clear', methods=['POST'])
 def api_debug_clear():
     """Clear debug logs"""
-    global client_debug_logs
-    client_debug_logs = []
+    client_debug_logs.clear()
     
     # Clear client debug log file
     client_log = LOG_DIR / 'client_debug.json'
@@ -7127,26 +7936,34 @@ def api_ai_debug_master_toggle_set():
         'message': f"AI Debug Access {'enabled - external access is now allowed' if AI_DEBUG_ENABLED else 'disabled - instance secured'}"
     })
 
+# Parts of the AI debug config response that never change at runtime
+_AI_DEBUG_STATIC_FIELDS = {
+    'endpoints': {
+        'file_read': '/api/ai-debug/file?path=<path>',
+        'file_write': '/api/ai-debug/file (POST)',
+        'exec': '/api/ai-debug/exec (POST)',
+        'docker': '/api/ai-debug/docker?cmd=<cmd>',
+        'sql': '/api/ai-debug/sql (POST)',
+        'logs': '/api/ai-debug/logs?type=<type>',
+        'diagnose': '/api/ai-debug/diagnose',
+        'system': '/api/ai-debug/system',
+        'websocket': f'ws://localhost:{SHELLDER_PORT}/ai-debug'
+    },
+    'port': SHELLDER_PORT,
+    'aegis_root': str(AEGIS_ROOT)
+}
+
 @app.route('/api/ai-debug/config')
 def api_ai_debug_config():
     """Get AI debug access configuration"""
-    return jsonify({
+    response = jsonify({
         'master_enabled': AI_DEBUG_ENABLED,
         'config': AI_DEBUG_CONFIG,
-        'endpoints': {
-            'file_read': '/api/ai-debug/file?path=<path>',
-            'file_write': '/api/ai-debug/file (POST)',
-            'exec': '/api/ai-debug/exec (POST)',
-            'docker': '/api/ai-debug/docker?cmd=<cmd>',
-            'sql': '/api/ai-debug/sql (POST)',
-            'logs': '/api/ai-debug/logs?type=<type>',
-            'diagnose': '/api/ai-debug/diagnose',
-            'system': '/api/ai-debug/system',
-            'websocket': f'ws://localhost:{SHELLDER_PORT}/ai-debug'
-        },
-        'port': SHELLDER_PORT,
-        'aegis_root': str(AEGIS_ROOT)
+        **_AI_DEBUG_STATIC_FIELDS
     })
+    # master_enabled and config flip on POST - never serve a cached copy
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/ai-debug/config', methods=['POST'])
 def api_ai_debug_config_update():
@@ -7169,8 +7986,10 @@ def api_ai_debug_file_read():
     
     Parameters:
         path: Relative path from Aegis root
-        lines: Optional, limit to last N lines
+        lines: Optional, limit to last N lines (or N lines from offset)
         offset: Optional, start from line N
+        count: Optional, 1 to report total_lines for partial reads
+        raw: Optional, 1 to stream the file itself as text/plain (no JSON)
     """
     if not AI_DEBUG_ENABLED:
         return jsonify({'error': 'AI Debug Access is disabled. Enable it in Shellder Settings to allow external access.'}), 403
@@ -7180,6 +7999,7 @@ def api_ai_debug_file_read():
     path = request.args.get('path', '')
     lines_limit = request.args.get('lines', type=int)
     offset = request.args.get('offset', 0, type=int)
+    want_count = request.args.get('count', 0, type=int) == 1
     
     if not path:
         return jsonify({'error': 'Path required'}), 400
@@ -7188,7 +8008,7 @@ def api_ai_debug_file_read():
     
     # Security: must be within Aegis root
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied - path outside Aegis directory'}), 403
     
@@ -7206,17 +8026,28 @@ def api_ai_debug_file_read():
             })
         return jsonify({'type': 'directory', 'path': path, 'files': files})
     
+    if request.args.get('raw', 0, type=int) == 1:
+        # Streamed in blocks (sendfile where the server supports it) - never buffered whole
+        return send_from_directory(AEGIS_ROOT, path, mimetype='text/plain')
+    
     try:
-        with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
-        total_lines = len(lines)
-        
+        total_lines = None
         if offset > 0:
-            lines = lines[offset:]
-        if lines_limit:
-            lines = lines[:lines_limit]
+            # Only the requested window is kept
+            with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
+                stop = offset + lines_limit if lines_limit else None
+                lines = [line.rstrip('\n') for line in islice(f, offset, stop)]
+        elif lines_limit:
+            # Tail: read backwards from the end instead of the whole file
+            lines = _tail(full_path, lines_limit)
+        else:
+            with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+            lines = content.split('\n')
+            total_lines = len(lines)
+        
+        if total_lines is None and want_count:
+            total_lines = _count_lines(full_path)
         
         return jsonify({
             'type': 'file',
@@ -7255,7 +8086,7 @@ def api_ai_debug_file_write():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -7271,13 +8102,25 @@ def api_ai_debug_file_write():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Deny-lists for the exec / sql endpoints, each matched in one compiled scan
+_DANGEROUS_CMD_RE = re.compile('|'.join(map(re.escape, ['rm -rf /', 'mkfs', 'dd if=', ':(){', 'chmod -R 777 /'])))
+_DANGEROUS_SQL_RE = re.compile(r'\b(DROP|DELETE|TRUNCATE|ALTER|UPDATE|INSERT)\b', re.IGNORECASE)
+
+# Anything /bin/sh would interpret (operators, globs, expansion, ~, comments,
+# line continuations, leading VAR=value); plain commands skip the shell
+_EXEC_SHELL_SYNTAX = re.compile(r'[|&;<>()$`*?\[\]{}~#!\\\n]|^\s*\w+=')
+
 @app.route('/api/ai-debug/exec', methods=['POST'])
 def api_ai_debug_exec():
     """
     Execute a shell command.
     
     Usage: POST /api/ai-debug/exec
-    Body: {"cmd": "docker ps", "timeout": 30, "cwd": "optional/path"}
+    Body: {"cmd": "docker ps", "timeout": 30, "cwd": "optional/path", "shell": false}
+    
+    Plain commands are executed directly from their argv; commands using
+    shell syntax (pipes, redirects, &&, globs, $VARS) - or "shell": true -
+    go through /bin/sh.
     
     Returns stdout, stderr, and return code.
     """
@@ -7295,20 +8138,34 @@ def api_ai_debug_exec():
         return jsonify({'error': 'Command required'}), 400
     
     # Security: block dangerous commands
-    dangerous = ['rm -rf /', 'mkfs', 'dd if=', ':(){', 'chmod -R 777 /']
-    for d in dangerous:
-        if d in cmd:
-            return jsonify({'error': f'Blocked dangerous command pattern: {d}'}), 403
+    match = _DANGEROUS_CMD_RE.search(cmd)
+    if match:
+        return jsonify({'error': f'Blocked dangerous command pattern: {match.group(0)}'}), 403
     
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=cwd
-        )
+        use_shell = bool(data.get('shell')) or bool(_EXEC_SHELL_SYNTAX.search(cmd))
+        result = None
+        if not use_shell:
+            try:
+                result = subprocess.run(
+                    shlex.split(cmd),
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    cwd=cwd
+                )
+            except (ValueError, FileNotFoundError):
+                # Unbalanced quotes, or a shell builtin (cd, export, ...) - let sh handle it
+                result = None
+        if result is None:
+            result = subprocess.run(
+                cmd,
+                shell=True,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=cwd
+            )
         
         return jsonify({
             'success': result.returncode == 0,
@@ -7323,6 +8180,58 @@ def api_ai_debug_exec():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _docker_stats_row(container):
+    """One `docker stats --no-stream` row (name, cpu, mem, net) from the SDK"""
+    stats = container.stats(stream=False)
+    cpu = stats.get('cpu_stats', {})
+    precpu = stats.get('precpu_stats', {})
+    cpu_delta = cpu.get('cpu_usage', {}).get('total_usage', 0) - precpu.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu.get('system_cpu_usage', 0) - precpu.get('system_cpu_usage', 0)
+    online_cpus = cpu.get('online_cpus') or len(cpu.get('cpu_usage', {}).get('percpu_usage') or [1])
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100 if system_delta > 0 and cpu_delta > 0 else 0.0
+    
+    # Like the CLI, don't count reclaimable page cache as used memory
+    memory = stats.get('memory_stats', {})
+    mem_stats = memory.get('stats', {})
+    mem_used = memory.get('usage', 0) - mem_stats.get('inactive_file', mem_stats.get('cache', 0))
+    
+    networks = (stats.get('networks') or {}).values()
+    rx = sum(n.get('rx_bytes', 0) for n in networks)
+    tx = sum(n.get('tx_bytes', 0) for n in networks)
+    return {
+        'name': container.name,
+        'cpu': f"{cpu_percent:.2f}%",
+        'mem': f"{format_bytes(mem_used)} / {format_bytes(memory.get('limit', 0))}",
+        'net': f"{format_bytes(rx)} / {format_bytes(tx)}"
+    }
+
+COMPOSE_PS_TTL = 1.0  # seconds
+_compose_ps_cache = {'ts': 0.0, 'data': None}
+_compose_ps_lock = threading.Lock()
+
+def _compose_ps(ttl=COMPOSE_PS_TTL):
+    """Parsed `docker compose ps --format json`, shared across callers for ttl seconds"""
+    if _compose_ps_cache['data'] is not None and time.monotonic() - _compose_ps_cache['ts'] < ttl:
+        return _compose_ps_cache['data']
+    with _compose_ps_lock:
+        # Another thread may have refreshed while we waited
+        if _compose_ps_cache['data'] is not None and time.monotonic() - _compose_ps_cache['ts'] < ttl:
+            return _compose_ps_cache['data']
+        result = subprocess.run(
+            ['docker', 'compose', 'ps', '--format', 'json'],
+            capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=30
+        )
+        containers = []
+        for line in result.stdout.strip().split('\n'):
+            if line:
+                try:
+                    containers.append(json.loads(line))
+                except ValueError:
+                    pass
+        _compose_ps_cache['data'] = containers
+        _compose_ps_cache['ts'] = time.monotonic()
+        return containers
+
 @app.route('/api/ai-debug/docker')
 def api_ai_debug_docker():
     """
@@ -7343,21 +8252,17 @@ def api_ai_debug_docker():
     
     try:
         if cmd == 'ps':
-            result = subprocess.run(
-                ['docker', 'compose', 'ps', '--format', 'json'],
-                capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=30
-            )
-            try:
-                containers = [json.loads(line) for line in result.stdout.strip().split('\n') if line]
-            except:
-                containers = result.stdout
-            return jsonify({'containers': containers})
+            return jsonify({'containers': _compose_ps()})
         
         elif cmd == 'logs' and container:
-            result = subprocess.run(
-                ['docker', 'logs', '--tail', str(lines), container],
-                capture_output=True, text=True, timeout=30
-            )
+            if docker_client:
+                logs = docker_client.containers.get(container).logs(tail=lines)
+                return jsonify({
+                    'container': container,
+                    'logs': logs.decode('utf-8', errors='replace'),
+                    'lines': lines
+                })
+            result = _run_quick(['docker', 'logs', '--tail', str(lines), container], timeout=30)
             return jsonify({
                 'container': container,
                 'logs': result.stdout + result.stderr,
@@ -7365,10 +8270,14 @@ def api_ai_debug_docker():
             })
         
         elif cmd == 'inspect' and container:
-            result = subprocess.run(
-                ['docker', 'inspect', container],
-                capture_output=True, text=True, timeout=30
-            )
+            if docker_client:
+                try:
+                    # Same list-of-one shape as `docker inspect`
+                    attrs = docker_client.containers.get(container).attrs
+                    return jsonify({'container': container, 'inspect': [attrs]})
+                except docker.errors.NotFound:
+                    pass  # Not a container - let the CLI inspect images/networks/volumes
+            result = _run_quick(['docker', 'inspect', container], timeout=30)
             try:
                 data = json.loads(result.stdout)
             except:
@@ -7376,10 +8285,14 @@ def api_ai_debug_docker():
             return jsonify({'container': container, 'inspect': data})
         
         elif cmd == 'stats':
-            result = subprocess.run(
+            if docker_client:
+                # stats(stream=False) waits for a second sample, so fetch them side by side
+                running = docker_client.containers.list()
+                return jsonify({'stats': list(_DIAG_POOL.map(_docker_stats_row, running))})
+            result = _run_quick(
                 ['docker', 'stats', '--no-stream', '--format', 
                  '{"name":"{{.Name}}","cpu":"{{.CPUPerc}}","mem":"{{.MemUsage}}","net":"{{.NetIO}}"}'],
-                capture_output=True, text=True, timeout=30
+                timeout=30
             )
             try:
                 stats = [json.loads(line) for line in result.stdout.strip().split('\n') if line]
@@ -7388,9 +8301,15 @@ def api_ai_debug_docker():
             return jsonify({'stats': stats})
         
         elif cmd == 'images':
-            result = subprocess.run(
-                ['docker', 'images', '--format', '{{.Repository}}:{{.Tag}} {{.Size}}'],
-                capture_output=True, text=True, timeout=30
+            if docker_client:
+                images = [
+                    f"{tag} {format_bytes(image.attrs.get('Size', 0))}"
+                    for image in docker_client.images.list()
+                    for tag in (image.tags or ['<none>:<none>'])
+                ]
+                return jsonify({'images': images})
+            result = _run_quick(
+                ['docker', 'images', '--format', '{{.Repository}}:{{.Tag}} {{.Size}}'], timeout=30
             )
             return jsonify({'images': result.stdout.strip().split('\n')})
         
@@ -7400,6 +8319,88 @@ def api_ai_debug_docker():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# MYSQL_USER / MYSQL_PASSWORD from AEGIS_ROOT/.env, re-parsed only when its mtime changes
+_ENV_CACHE = {'mtime': None, 'user': 'pokemon', 'pass': ''}
+
+def _load_db_creds():
+    """(db_user, db_pass) from .env, cached until the file is modified"""
+    env_path = AEGIS_ROOT / '.env'
+    try:
+        mtime = env_path.stat().st_mtime_ns
+    except OSError:
+        return 'pokemon', ''
+    
+    if mtime != _ENV_CACHE['mtime']:
+        db_user, db_pass = 'pokemon', ''
+        with open(env_path, 'r') as f:
+            for line in f:
+                if line.startswith('MYSQL_USER='):
+                    db_user = line.split('=', 1)[1].strip().strip('"\'')
+                elif line.startswith('MYSQL_PASSWORD='):
+                    db_pass = line.split('=', 1)[1].strip().strip('"\'')
+        _ENV_CACHE.update({'mtime': mtime, 'user': db_user, 'pass': db_pass})
+    return _ENV_CACHE['user'], _ENV_CACHE['pass']
+
+# Idle PyMySQL connections for /api/ai-debug/sql, one small pool per
+# (database, user, password) so a credential change in .env starts a fresh pool
+SQL_POOL_SIZE = 4
+_sql_pools = {}
+_sql_pools_lock = threading.Lock()
+
+def _sql_checkout(database, db_user, db_pass):
+    """Take an idle pooled connection (or open one); returns (pool, connection)"""
+    key = (database, db_user, db_pass)
+    with _sql_pools_lock:
+        pool = _sql_pools.get(key)
+        if pool is None:
+            pool = _sql_pools[key] = queue.Queue(maxsize=SQL_POOL_SIZE)
+    
+    try:
+        conn = pool.get_nowait()
+        conn.ping(reconnect=True)
+    except queue.Empty:
+        conn = pymysql.connect(host='127.0.0.1', user=db_user, password=db_pass,
+                               database=database, autocommit=True,
+                               connect_timeout=5, read_timeout=30)
+    return pool, conn
+
+def _sql_checkin(pool, conn):
+    """Return a healthy connection to its pool, closing it if the pool is full"""
+    try:
+        pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+# Statements that can't leave session state (USE, SET, temp tables...) behind
+_SQL_STATELESS_RE = re.compile(r'\s*(SELECT|SHOW|DESCRIBE|DESC|EXPLAIN)\b', re.IGNORECASE)
+
+def _run_sql_pooled(database, query, db_user, db_pass):
+    """Run query over a pooled connection; returns (columns, rows as dicts)"""
+    pool, conn = _sql_checkout(database, db_user, db_pass)
+    # Anything else may have switched schema or changed session variables, and
+    # the next request for this pool key must not inherit that
+    reusable = _SQL_STATELESS_RE.match(query) is not None
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query)
+            headers = [d[0] for d in cur.description or ()]
+            rows = [dict(zip(headers, map(sql_value, row))) for row in cur.fetchall()]
+    except pymysql.err.OperationalError:
+        # Connection-level failure - don't hand this one out again
+        conn.close()
+        raise
+    except Exception:
+        if reusable:
+            _sql_checkin(pool, conn)
+        else:
+            conn.close()
+        raise
+    if reusable:
+        _sql_checkin(pool, conn)
+    else:
+        conn.close()
+    return headers, rows
+
 @app.route('/api/ai-debug/sql', methods=['POST'])
 def api_ai_debug_sql():
     """
@@ -7423,25 +8424,26 @@ def api_ai_debug_sql():
         return jsonify({'error': 'Query required'}), 400
     
     # Block dangerous queries
-    dangerous = ['DROP ', 'DELETE ', 'TRUNCATE ', 'ALTER ', 'UPDATE ', 'INSERT ']
-    query_upper = query.upper()
-    for d in dangerous:
-        if d in query_upper and 'SELECT' not in query_upper:
-            return jsonify({'error': f'Blocked dangerous query: {d}'}), 403
+    match = _DANGEROUS_SQL_RE.search(query)
+    if match and 'SELECT' not in query.upper():
+        return jsonify({'error': f'Blocked dangerous query: {match.group(1).upper()}'}), 403
     
     try:
         # Read database credentials from .env
-        env_path = AEGIS_ROOT / '.env'
-        db_user = 'pokemon'
-        db_pass = ''
+        db_user, db_pass = _load_db_creds()
         
-        if env_path.exists():
-            with open(env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('MYSQL_USER='):
-                        db_user = line.split('=', 1)[1].strip().strip('"\'')
-                    elif line.startswith('MYSQL_PASSWORD='):
-                        db_pass = line.split('=', 1)[1].strip().strip('"\'')
+        if PYMYSQL_AVAILABLE:
+            try:
+                headers, rows = _run_sql_pooled(database, query, db_user, db_pass)
+            except pymysql.err.MySQLError as e:
+                return jsonify({'error': str(e), 'database': database}), 500
+            return jsonify({
+                'database': database,
+                'query': query,
+                'columns': headers,
+                'rows': rows,
+                'row_count': len(rows)
+            })
         
         # Execute via mysql CLI
         cmd = ['mysql', '-h', '127.0.0.1', '-u', db_user, f'-p{db_pass}', 
@@ -7452,11 +8454,11 @@ def api_ai_debug_sql():
         if result.returncode != 0:
             return jsonify({'error': result.stderr, 'database': database}), 500
         
-        # Parse results
-        lines = result.stdout.strip().split('\n')
-        if len(lines) > 0:
-            headers = lines[0].split('\t') if lines else []
-            rows = [dict(zip(headers, line.split('\t'))) for line in lines[1:]] if len(lines) > 1 else []
+        # Parse results - batch output is tab-separated with no quoting
+        reader = csv.reader(io.StringIO(result.stdout), delimiter='\t', quoting=csv.QUOTE_NONE)
+        headers = next(reader, None)
+        if headers is not None:
+            rows = [dict(zip(headers, row)) for row in reader]
             return jsonify({
                 'database': database,
                 'query': query,
@@ -7494,36 +8496,34 @@ def api_ai_debug_logs():
         if log_type == 'shellder':
             log_path = LOG_DIR / 'debuglog.txt'
             if log_path.exists():
-                with open(log_path, 'r', errors='replace') as f:
-                    content = f.readlines()[-lines:]
-                return jsonify({'type': 'shellder', 'lines': content})
+                return jsonify({'type': 'shellder', 'lines': _tail(log_path, lines)})
         
         elif log_type == 'docker':
-            result = subprocess.run(
-                ['journalctl', '-u', 'docker', '-n', str(lines), '--no-pager'],
-                capture_output=True, text=True, timeout=30
+            result = _run_quick(
+                ['journalctl', '-u', 'docker', '-n', str(lines), '--no-pager'], timeout=30
             )
             return jsonify({'type': 'docker', 'lines': result.stdout.split('\n')})
         
         elif log_type == 'nginx':
             nginx_log = Path('/var/log/nginx/error.log')
             if nginx_log.exists():
+                # Read it in-process when we can; only shell out to sudo if it's not readable
+                try:
+                    return jsonify({'type': 'nginx', 'lines': _tail(nginx_log, lines)})
+                except PermissionError:
+                    pass
                 result = subprocess.run(['sudo', 'tail', '-n', str(lines), str(nginx_log)],
                                        capture_output=True, text=True, timeout=10)
                 return jsonify({'type': 'nginx', 'lines': result.stdout.split('\n')})
         
         elif log_type == 'system':
-            result = subprocess.run(
-                ['journalctl', '-n', str(lines), '--no-pager', '-p', 'err'],
-                capture_output=True, text=True, timeout=30
+            result = _run_quick(
+                ['journalctl', '-n', str(lines), '--no-pager', '-p', 'err'], timeout=30
             )
             return jsonify({'type': 'system', 'lines': result.stdout.split('\n')})
         
         elif log_type == 'container' and container:
-            result = subprocess.run(
-                ['docker', 'logs', '--tail', str(lines), container],
-                capture_output=True, text=True, timeout=30
-            )
+            result = _run_quick(['docker', 'logs', '--tail', str(lines), container], timeout=30)
             return jsonify({
                 'type': 'container',
                 'container': container,
@@ -7535,6 +8535,80 @@ def api_ai_debug_logs():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Shared pool for the diagnose probes; a probe that overruns DIAG_TIMEOUT is
+# left out of the response rather than holding it up
+_DIAG_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='diag')
+DIAG_TIMEOUT = 10  # seconds
+_DIAG_PORTS = (('Shellder', SHELLDER_PORT), ('MariaDB', 3306), ('Rotom', 7070), ('Dragonite', 7272))
+_DIAG_FILES = ('.env', 'docker-compose.yaml', 'unown/dragonite_config.toml', 'unown/golbat_config.toml')
+
+# psutil system snapshot shared by the ai-debug endpoints, reused for SYSINFO_TTL.
+# CPU comes from StatsCollector, which samples it over a 1s interval on its own
+# thread - psutil keeps the cpu_percent(None) baseline per thread, so a request
+# thread calling it would only ever measure a near-zero interval.
+SYSINFO_TTL = 1.0  # seconds
+_sysinfo_cache = {'ts': 0.0, 'data': None}
+
+def _sampled_cpu_percent():
+    """Latest CPU % published by StatsCollector, or a short blocking sample"""
+    cpu = stats_collector.get_all_stats(shallow=True)['system'].get('cpu_percent')
+    if cpu is None:
+        # Collector has not published yet (first second after start)
+        cpu = psutil.cpu_percent(interval=0.1)
+    return cpu
+
+def _get_sysinfo():
+    """Cached cpu/memory/disk snapshot (None without psutil)"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    now = time.monotonic()
+    if _sysinfo_cache['data'] is None or now - _sysinfo_cache['ts'] >= SYSINFO_TTL:
+        freq = psutil.cpu_freq()
+        _sysinfo_cache['data'] = {
+            'cpu_percent': _sampled_cpu_percent(),
+            'cpu_count': psutil.cpu_count(),
+            'cpu_freq': freq._asdict() if freq else None,
+            'memory': psutil.virtual_memory()._asdict(),
+            'disk': psutil.disk_usage('/')._asdict(),
+            'uptime_seconds': time.time() - psutil.boot_time()
+        }
+        _sysinfo_cache['ts'] = now
+    return _sysinfo_cache['data']
+
+def _diag_system():
+    """CPU / memory / disk / uptime snapshot for diagnose"""
+    sysinfo = _get_sysinfo()
+    if not sysinfo:
+        return {}
+    return {
+        'cpu_percent': sysinfo['cpu_percent'],
+        'memory_percent': sysinfo['memory']['percent'],
+        'disk_percent': sysinfo['disk']['percent'],
+        'uptime_seconds': sysinfo['uptime_seconds']
+    }
+
+def _diag_containers():
+    """Stack containers as reported by docker compose ps"""
+    return _compose_ps()
+
+def _diag_ports():
+    """Open/closed state of the key stack ports, probed concurrently"""
+    try:
+        states = probe_ports([port for _, port in _DIAG_PORTS], timeout=1)
+    except OSError:
+        states = probe_ports_threaded([port for _, port in _DIAG_PORTS], timeout=1)
+    return {name: {'port': port, 'open': states[port]} for name, port in _DIAG_PORTS}
+
+def _diag_files():
+    """Existence and size of the key config files"""
+    files = {}
+    for f in _DIAG_FILES:
+        try:
+            files[f] = {'exists': True, 'size': (AEGIS_ROOT / f).stat().st_size}
+        except OSError:
+            files[f] = {'exists': False, 'size': 0}
+    return files
+
 @app.route('/api/ai-debug/diagnose')
 def api_ai_debug_diagnose():
     """
@@ -7559,56 +8633,17 @@ def api_ai_debug_diagnose():
         'files': {}
     }
     
-    try:
-        # System info
-        import psutil
-        diagnostics['system'] = {
-            'cpu_percent': psutil.cpu_percent(),
-            'memory_percent': psutil.virtual_memory().percent,
-            'disk_percent': psutil.disk_usage('/').percent,
-            'uptime_seconds': time.time() - psutil.boot_time()
-        }
-    except:
-        pass
-    
-    try:
-        # Containers
-        result = subprocess.run(
-            ['docker', 'compose', 'ps', '--format', 'json'],
-            capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=30
-        )
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                try:
-                    diagnostics['containers'].append(json.loads(line))
-                except:
-                    pass
-    except:
-        pass
-    
-    try:
-        # Key ports
-        import socket
-        for name, port in [('Shellder', SHELLDER_PORT), ('MariaDB', 3306), ('Rotom', 7070), ('Dragonite', 7272)]:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('127.0.0.1', port))
-            diagnostics['ports'][name] = {'port': port, 'open': result == 0}
-            sock.close()
-    except:
-        pass
-    
-    try:
-        # Key files
-        key_files = ['.env', 'docker-compose.yaml', 'unown/dragonite_config.toml', 'unown/golbat_config.toml']
-        for f in key_files:
-            path = AEGIS_ROOT / f
-            diagnostics['files'][f] = {
-                'exists': path.exists(),
-                'size': path.stat().st_size if path.exists() else 0
-            }
-    except:
-        pass
+    # Each probe is independent and mostly waits on I/O - run them side by side
+    probes = {
+        'system': _DIAG_POOL.submit(_diag_system),
+        'containers': _DIAG_POOL.submit(_diag_containers),
+        'ports': _DIAG_POOL.submit(_diag_ports),
+        'files': _DIAG_POOL.submit(_diag_files)
+    }
+    wait_futures(probes.values(), timeout=DIAG_TIMEOUT)
+    for key, future in probes.items():
+        if future.done() and not future.exception():
+            diagnostics[key] = future.result()
     
     return jsonify(diagnostics)
 
@@ -7634,26 +8669,34 @@ def api_ai_debug_system():
     }
     
     try:
-        import psutil
-        info['cpu'] = {
-            'count': psutil.cpu_count(),
-            'percent': psutil.cpu_percent(interval=0.1),
-            'freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
-        }
-        info['memory'] = psutil.virtual_memory()._asdict()
-        info['disk'] = psutil.disk_usage('/')._asdict()
+        sysinfo = _get_sysinfo()
+        if sysinfo:
+            info['cpu'] = {
+                'count': sysinfo['cpu_count'],
+                'percent': sysinfo['cpu_percent'],
+                'freq': sysinfo['cpu_freq']
+            }
+            info['memory'] = sysinfo['memory']
+            info['disk'] = sysinfo['disk']
     except:
         pass
     
     try:
-        # Git info
-        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
-                               capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=5)
-        info['git_commit'] = result.stdout.strip() if result.returncode == 0 else None
-        
-        result = subprocess.run(['git', 'branch', '--show-current'],
-                               capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=5)
-        info['git_branch'] = result.stdout.strip() if result.returncode == 0 else None
+        # Git info - the two lookups are independent, so run them side by side
+        git_procs = {
+            key: subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                  text=True, env=_GIT_ENV, close_fds=False)
+            for key, cmd in (('git_commit', _git_argv('rev-parse', '--short', 'HEAD')),
+                             ('git_branch', _git_argv('branch', '--show-current')))
+        }
+        for key, proc in git_procs.items():
+            try:
+                out, _ = proc.communicate(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+            info[key] = out.strip() if proc.returncode == 0 else None
     except:
         pass
     
@@ -8031,7 +9074,7 @@ def api_status():
         debug('API', 'Returning mock status (LOCAL_MODE or no Docker)')
         return jsonify(get_mock_status())
     
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     
     containers = []
     running = 0
@@ -8104,7 +9147,31 @@ def api_status():
 # =============================================================================
 # DISK HEALTH MONITORING
 # =============================================================================
-# Known bloat sources that can safely be cleaned
+_JOURNAL_USAGE_RE = re.compile(r'take up ([\d.]+)\s*([KMGTPE]?)B?\b')
+
+def _journal_disk_usage(path):
+    """
+    Size of the systemd journal from `journalctl --disk-usage`, which reads it
+    from journald instead of walking the journal directory. None if unavailable.
+    
+    As non-root journalctl only counts the files this user may open (and still
+    exits 0), so like _du_size it goes through `sudo -n`.
+    """
+    argv = ['journalctl', '--disk-usage']
+    if hasattr(os, 'geteuid') and os.geteuid() != 0:
+        argv = ['sudo', '-n'] + argv
+    try:
+        result = _run_quick(argv, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    match = _JOURNAL_USAGE_RE.search(result.stdout)
+    if result.returncode != 0 or not match:
+        return None
+    value, unit = match.groups()
+    return int(float(value) * 1024 ** ' KMGTPE'.index(unit or ' '))
+
+# Known bloat sources that can safely be cleaned. An optional 'size_probe'
+# (path -> bytes or None) sizes a path with a dedicated tool instead of a walk.
 KNOWN_BLOAT_SOURCES = [
     {
         'id': 'gnome_tracker',
@@ -8133,6 +9200,7 @@ KNOWN_BLOAT_SOURCES = [
         'name': 'Systemd Journal Logs',
         'description': 'System logs that can grow very large',
         'paths': ['/var/log/journal/'],
+        'size_probe': _journal_disk_usage,
         'cleanup_commands': ['sudo journalctl --vacuum-size=500M'],
         'safe': True,
         'severity': 'medium',
@@ -8199,140 +9267,407 @@ DISK_THRESHOLD_CRITICAL = 85  # Red critical
 DISK_THRESHOLD_EMERGENCY = 95  # Emergency - system may become unstable
 
 # Track disk usage history for growth detection
-_disk_history = []
 _disk_history_max = 60  # Keep 60 samples (1 hour at 1 min intervals)
+_disk_history = deque(maxlen=_disk_history_max)
 
-def _get_disk_usage():
-    """Get current disk usage"""
+DISK_USAGE_TTL = 1.0  # seconds
+_disk_usage_cache = {'ts': 0.0, 'data': None}
+
+def _get_disk_usage(fresh=False):
+    """
+    Get current disk usage.
+    
+    Polling endpoints share one statfs() per DISK_USAGE_TTL; pass fresh=True
+    when the answer must reflect something that just happened (a cleanup).
+    """
     if not PSUTIL_AVAILABLE:
         return None
+    now = time.monotonic()
+    if not fresh and _disk_usage_cache['data'] is not None and now - _disk_usage_cache['ts'] < DISK_USAGE_TTL:
+        return _disk_usage_cache['data']
     try:
         usage = psutil.disk_usage('/')
-        return {
-            'total': usage.total,
-            'used': usage.used,
-            'free': usage.free,
-            'percent': usage.percent
-        }
     except Exception as e:
         error('DISK', f'Failed to get disk usage: {e}')
         return None
+    _disk_usage_cache['data'] = {
+        'total': usage.total,
+        'used': usage.used,
+        'free': usage.free,
+        'percent': usage.percent
+    }
+    _disk_usage_cache['ts'] = now
+    return _disk_usage_cache['data']
+
+def _find_bloat_home():
+    """Home directory ~ refers to in bloat paths - the main user's, not root's"""
+    try:
+        if IS_UNIX and pwd:
+            # Get the home directory of the user running the service
+            # Look for common non-root users
+            for user in ['pokemap', 'aegis', 'ubuntu', 'admin']:
+                try:
+                    return pwd.getpwnam(user).pw_dir
+                except KeyError:
+                    continue
+    except Exception:
+        pass
+    # Fall back to current user's home
+    return os.path.expanduser('~')
+
+# Looked up once - users don't come and go while the service runs
+_BLOAT_HOME_DIR = _find_bloat_home()
 
+@lru_cache(maxsize=None)
 def _expand_path(path):
     """Expand ~ in path to actual home directory"""
     if path.startswith('~'):
-        # Try to find the main user's home (not root)
-        home_dir = None
-        try:
-            if IS_UNIX and pwd:
-                # Get the home directory of the user running the service
-                # Look for common non-root users
-                for user in ['pokemap', 'aegis', 'ubuntu', 'admin']:
-                    try:
-                        pw = pwd.getpwnam(user)
-                        home_dir = pw.pw_dir
-                        break
-                    except KeyError:
-                        continue
-            # Fall back to current user's home
-            if not home_dir:
-                home_dir = os.path.expanduser('~')
-        except:
-            home_dir = os.path.expanduser('~')
-        return path.replace('~', home_dir, 1)
+        return path.replace('~', _BLOAT_HOME_DIR, 1)
     return path
 
-def _get_dir_size(path):
-    """Get total size of a directory"""
-    expanded_path = _expand_path(path)
-    if not os.path.exists(expanded_path):
-        return 0
+def _expand_command(cmd, paths):
+    """Substitute the expanded form of any ~ paths used in a cleanup command"""
+    for path in paths:
+        if '~' in path:
+            cmd = cmd.replace(path, _expand_path(path))
+    return cmd
+
+# Resolve ~ once at startup instead of on every cleanup run
+for _source in KNOWN_BLOAT_SOURCES:
+    _source['expanded_paths'] = [_expand_path(p) for p in _source['paths']]
+    _source['expanded_cleanup_commands'] = [
+        _expand_command(cmd, _source['paths']) for cmd in _source['cleanup_commands']
+    ]
+# expanded path -> size_probe, for sources that have one
+_BLOAT_PROBES = {p: _source['size_probe'] for _source in KNOWN_BLOAT_SOURCES if 'size_probe' in _source
+                 for p in _source['expanded_paths']}
+
+def _offload(fn, *args):
+    """
+    Call fn(*args) on a real OS thread when running under eventlet.
     
-    total = 0
+    Monkey-patched ThreadPoolExecutor workers are green threads, and blocking
+    filesystem calls (scandir, stat, unlink) never yield to the hub - a pool
+    task wrapped in this runs on eventlet's native thread pool instead, so
+    the tasks actually overlap and the hub stays responsive meanwhile.
+    """
+    if ASYNC_MODE == 'eventlet':
+        return tpool.execute(fn, *args)
+    return fn(*args)
+
+# scandir() on a directory fd makes DirEntry.stat() an fstatat() relative to
+# that fd, so the kernel resolves one name per file instead of the full path
+_SCANDIR_FD = os.scandir in os.supports_fd
+
+def _scan_dir(path):
+    """
+    Iterate the entries of path like os.scandir(path).
+    
+    Where supported the directory is opened by fd, in which case entry.path is
+    just the name - join it onto path when the full path is needed.
+    """
+    if not _SCANDIR_FD:
+        with os.scandir(path) as entries:
+            yield from entries
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
     try:
-        for dirpath, dirnames, filenames in os.walk(expanded_path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                try:
-                    total += os.path.getsize(filepath)
-                except (OSError, FileNotFoundError):
-                    pass
-    except PermissionError:
-        # Try using du command as fallback
+        with os.scandir(fd) as entries:
+            yield from entries
+    finally:
+        os.close(fd)
+
+def _disk_bytes(st):
+    """Bytes a file actually occupies - sparse journal files and image layers
+    report far more in st_size (Windows has no st_blocks)"""
+    blocks = getattr(st, 'st_blocks', None)
+    return st.st_size if blocks is None else blocks * 512
+
+def _scandir_size(path, limit=None, _seen=None):
+    """
+    Disk space used by everything under path, counted like du.
+    
+    Uses the scandir d_type to tell directories apart, so each file costs a
+    single lstat. Allocated blocks are summed rather than st_size, and files
+    with several hard links are only counted once. Unreadable subdirectories
+    are skipped, the same as du does; an unreadable (or missing) path itself
+    raises. With a limit, the walk stops as soon as the total exceeds it and
+    returns that partial total.
+    """
+    if _seen is None:
+        _seen = set()
+    total = 0
+    for entry in _scan_dir(path):
         try:
-            result = subprocess.run(
-                ['du', '-sb', expanded_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                total = int(result.stdout.split()[0])
-        except:
+            if entry.is_dir(follow_symlinks=False):
+                # The directory's own blocks count too, as in du
+                total += _disk_bytes(entry.stat(follow_symlinks=False))
+                total += _scandir_size(os.path.join(path, entry.name),
+                                       None if limit is None else limit - total, _seen)
+            else:
+                st = entry.stat(follow_symlinks=False)
+                if st.st_nlink > 1:
+                    key = (st.st_dev, st.st_ino)
+                    if key in _seen:
+                        continue
+                    _seen.add(key)
+                total += _disk_bytes(st)
+        except OSError:
             pass
+        if limit is not None and total > limit:
+            break
     return total
 
+def _get_dir_size(path, early_exit=None):
+    """
+    Get total size of a directory (0 if it is missing or unreadable).
+    
+    early_exit: stop counting once the size passes this many bytes - for
+    callers that only need to know whether a directory is over a threshold.
+    """
+    expanded_path = _expand_path(path)
+    try:
+        return _scandir_size(expanded_path, early_exit)
+    except OSError:
+        return 0
+
+# Parallel du runs for trees the service can't read itself (docker, journal).
+# Kept low so the sweep doesn't saturate the disk.
+BLOAT_DU_CONCURRENCY = max(1, int(os.environ.get('SHELLDER_DU_CONCURRENCY', 4)))
+
+def _du_size(path):
+    """Disk usage of path via `du -s`, through `sudo -n` unless we already are root"""
+    argv = ['du', '-s', '--block-size=1', '--', path]
+    if hasattr(os, 'geteuid') and os.geteuid() != 0:
+        argv = ['sudo', '-n'] + argv
+    try:
+        # du exits non-zero when it skips something but still prints the total
+        result = _run_quick(argv, timeout=60)
+        return int(result.stdout.split()[0])
+    except (OSError, subprocess.TimeoutExpired, IndexError, ValueError):
+        return 0
+
+# Directory names _find_large_files never descends into
+_LARGE_FILE_PRUNE = frozenset({'.git', 'node_modules', '__pycache__'})
+# Directories within this many levels of a search root that have more than
+# _SCAN_SPLIT_MIN_SUBDIRS subdirectories are fanned out as separate scan tasks
+_SCAN_SPLIT_DEPTH = 3
+_SCAN_SPLIT_MIN_SUBDIRS = 4
+
+def _is_rotational(path):
+    """True if path lives on a spinning disk (parallel scans would just seek)"""
+    try:
+        dev = os.stat(path).st_dev
+        block = f'/sys/dev/block/{os.major(dev)}:{os.minor(dev)}'
+        # Partitions keep queue/ on their parent device
+        for queue_dir in (block, block + '/..'):
+            try:
+                with open(f'{queue_dir}/queue/rotational') as f:
+                    return f.read().strip() == '1'
+            except OSError:
+                continue
+    except (OSError, AttributeError):
+        pass
+    return False
+
+def _push_largest(largest, item, max_results):
+    """Keep item in the min-heap largest if it is among the max_results biggest"""
+    if len(largest) < max_results:
+        heapq.heappush(largest, item)
+    elif max_results > 0:
+        heapq.heappushpop(largest, item)
+
+def _scan_subtree(path, depth, root_dev, min_size_bytes, max_results, skip_dirs):
+    """
+    Collect the largest files under path for _find_large_files.
+    
+    Like `find -xdev`, directories on a different device than root_dev (the
+    search root's) are not entered.
+    
+    Returns (largest, split): largest is a min-heap of (size, mtime, path) and
+    split holds (subdir, depth, root_dev) tuples left for the caller to scan
+    as new tasks.
+    """
+    largest = []
+    split = []
+    stack = [(path, depth)]
+    while stack:
+        dirpath, level = stack.pop()
+        if dirpath.startswith(skip_dirs):
+            continue
+        subdirs = []
+        try:
+            for entry in _scan_dir(dirpath):
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if (entry.name not in _LARGE_FILE_PRUNE
+                                and entry.stat(follow_symlinks=False).st_dev == root_dev):
+                            subdirs.append((os.path.join(dirpath, entry.name), level + 1))
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if st.st_size >= min_size_bytes:
+                    _push_largest(largest, (st.st_size, st.st_mtime, os.path.join(dirpath, entry.name)),
+                                  max_results)
+        except OSError:
+            continue
+        if level < _SCAN_SPLIT_DEPTH and len(subdirs) > _SCAN_SPLIT_MIN_SUBDIRS:
+            split.extend((subdir, subdepth, root_dev) for subdir, subdepth in subdirs)
+        else:
+            stack.extend(subdirs)
+    return largest, split
+
+# Path prefixes _find_large_files never scans
+_LARGE_FILE_SKIP = ('/proc', '/sys', '/dev', '/run', '/snap', '/mnt', '/media')
+# Filesystem types never worth scanning for large files - remote or read-only images
+_SCAN_SKIP_FSTYPES = frozenset({'nfs', 'nfs4', 'cifs', 'smb3', 'fuse.sshfs', 'squashfs'})
+
+def _skipped_mounts():
+    """Mount points of network / squashfs filesystems, from /proc/self/mountinfo"""
+    mounts = set()
+    try:
+        with open('/proc/self/mountinfo') as f:
+            for line in f:
+                # "<id> <parent> <maj:min> <root> <mount point> <opts> [tags] - <fstype> ..."
+                fields = line.split()
+                try:
+                    fstype = fields[fields.index('-') + 1]
+                except (ValueError, IndexError):
+                    continue
+                if fstype in _SCAN_SKIP_FSTYPES:
+                    mounts.add(fields[4].replace('\\040', ' '))
+    except OSError:
+        pass
+    return mounts
+
 def _find_large_files(min_size_mb=100, max_results=20):
     """Find large files on the system"""
-    large_files = []
     min_size_bytes = min_size_mb * 1024 * 1024
     
-    # Directories to search
-    search_dirs = ['/home', '/var', '/tmp', '/root']
-    # Directories to skip
-    skip_dirs = {'/proc', '/sys', '/dev', '/run', '/snap'}
-    
-    for search_dir in search_dirs:
-        if not os.path.exists(search_dir):
-            continue
-        
+    # Directories to search, with the device each one lives on
+    search_dirs = {}
+    for d in ('/home', '/var', '/tmp', '/root'):
         try:
-            for dirpath, dirnames, filenames in os.walk(search_dir):
-                # Skip certain directories
-                if any(dirpath.startswith(skip) for skip in skip_dirs):
-                    continue
-                
-                # Don't descend into certain directories
-                dirnames[:] = [d for d in dirnames if d not in ['.git', 'node_modules', '__pycache__']]
-                
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        size = os.path.getsize(filepath)
-                        if size >= min_size_bytes:
-                            large_files.append({
-                                'path': filepath,
-                                'size': size,
-                                'size_human': format_bytes(size),
-                                'modified': datetime.fromtimestamp(os.path.getmtime(filepath)).isoformat()
-                            })
-                    except (OSError, FileNotFoundError):
-                        pass
-        except PermissionError:
-            continue
+            search_dirs[d] = os.stat(d).st_dev
+        except OSError:
+            pass
+    # Directories to skip - a tuple so str.startswith() checks them all in one call
+    skip_dirs = _LARGE_FILE_SKIP + tuple(_skipped_mounts())
+    
+    largest = []
+    def merge(items):
+        for item in items:
+            _push_largest(largest, item, max_results)
+    
+    if any(_is_rotational(d) for d in search_dirs):
+        # Concurrent scans on a spinning disk only add seeks - walk serially
+        for search_dir, root_dev in search_dirs.items():
+            items, split = _scan_subtree(search_dir, 0, root_dev, min_size_bytes, max_results, skip_dirs)
+            merge(items)
+            while split:
+                items, more = _scan_subtree(*split.pop(), min_size_bytes, max_results, skip_dirs)
+                merge(items)
+                split.extend(more)
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            def submit(path, depth, root_dev):
+                return executor.submit(_offload, _scan_subtree, path, depth, root_dev,
+                                       min_size_bytes, max_results, skip_dirs)
+            pending = {submit(d, 0, root_dev) for d, root_dev in search_dirs.items()}
+            while pending:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    items, split = future.result()
+                    merge(items)
+                    pending.update(submit(*task) for task in split)
     
     # Sort by size descending
-    large_files.sort(key=lambda x: x['size'], reverse=True)
-    return large_files[:max_results]
+    return [
+        {
+            'path': path,
+            'size': size,
+            'modified': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(mtime))
+        }
+        for size, mtime, path in sorted(largest, reverse=True)
+    ]
 
-def _detect_bloat():
-    """Detect known bloat sources and their sizes"""
+# Sizes from the most recent _detect_bloat sweep, so a cleanup started from
+# the bloat list doesn't re-walk the tree just to report "size before"
+BLOAT_SIZE_TTL = 60  # seconds
+_bloat_sizes = {}  # expanded path -> (monotonic time, size)
+
+def _recent_bloat_size(path):
+    """_bloat_path_size(path), reusing the last bloat sweep's figure if still fresh"""
+    cached = _bloat_sizes.get(path)
+    if cached and time.monotonic() - cached[0] < BLOAT_SIZE_TTL:
+        return cached[1]
+    if not os.path.exists(path):
+        return 0
+    return _bloat_path_size(path)
+
+def _with_size_human(entry, key='size'):
+    """Add the formatted <key>_human field for a raw byte count - done only
+    for entries that actually go out in a response"""
+    entry[f'{key}_human'] = format_bytes(entry[key])
+    return entry
+
+def _bloat_path_size(path, early_exit=None):
+    """Size one bloat path the way _detect_bloat does: its size_probe if it has
+    one, else an in-process walk, else du for paths we can't read"""
+    probe = _BLOAT_PROBES.get(path)
+    if probe:
+        size = probe(path)
+        if size is not None:
+            return size
+    if os.access(path, os.R_OK | os.X_OK):
+        return _offload(_get_dir_size, path, early_exit)
+    return _du_size(path)
+
+def _bloat_paths_size(paths):
+    """Total _bloat_path_size of the paths that exist - for "size after" figures,
+    so they are measured the same way as the sweep's "size before" """
+    return sum(_bloat_path_size(p) for p in paths if os.path.exists(p))
+
+def _detect_bloat(early_exit=None):
+    """
+    Detect known bloat sources and their sizes.
+    
+    early_exit: passed to _get_dir_size - sizes above it are lower bounds
+    """
     detected = []
     
+    # Each path is an independent subtree scan - size them all side by side.
+    # Ones we can't read go to du instead, on their own smaller pool, as do
+    # sources with a size_probe (falling back to the walk/du if it fails).
+    paths = {p for source in KNOWN_BLOAT_SOURCES for p in source['expanded_paths'] if os.path.exists(p)}
+    sizes = {}
+    if paths:
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as scan_pool, \
+                ThreadPoolExecutor(max_workers=BLOAT_DU_CONCURRENCY) as du_pool:
+            futures = {
+                p: du_pool.submit(_bloat_path_size, p, early_exit) if p in _BLOAT_PROBES
+                else scan_pool.submit(_offload, _get_dir_size, p, early_exit) if os.access(p, os.R_OK | os.X_OK)
+                else du_pool.submit(_du_size, p)
+                for p in paths
+            }
+        sizes = {p: future.result() for p, future in futures.items()}
+        if early_exit is None:
+            now = time.monotonic()
+            _bloat_sizes.update((p, (now, size)) for p, size in sizes.items())
+    
     for source in KNOWN_BLOAT_SOURCES:
         total_size = 0
         found_paths = []
         
-        for path in source['paths']:
-            expanded = _expand_path(path)
-            if os.path.exists(expanded):
-                size = _get_dir_size(path)
+        for expanded in source['expanded_paths']:
+            if expanded in sizes:
+                size = sizes[expanded]
                 if size > 0:
                     total_size += size
                     found_paths.append({
                         'path': expanded,
-                        'size': size,
-                        'size_human': format_bytes(size)
+                        'size': size
                     })
         
         if total_size > 0:
@@ -8341,7 +9676,6 @@ def _detect_bloat():
                 'name': source['name'],
                 'description': source['description'],
                 'total_size': total_size,
-                'total_size_human': format_bytes(total_size),
                 'paths': found_paths,
                 'safe': source['safe'],
                 'severity': source['severity'],
@@ -8352,6 +9686,247 @@ def _detect_bloat():
     detected.sort(key=lambda x: x['total_size'], reverse=True)
     return detected
 
+# Characters that need /bin/sh to interpret a cleanup command
+_SHELL_SYNTAX = re.compile(r'[|&;<>()$`*?\[\]{}]')
+# Trailing "2>/dev/null || true" / "|| true" - best-effort commands whose
+# failure (or absence) doesn't matter; handled without a shell
+_IGNORE_ERRORS_SUFFIX = re.compile(r'\s+(2>/dev/null\s+)?\|\|\s*true\s*$')
+
+def _remove_tree(path):
+    """Delete a file or directory tree in-process, returning bytes freed"""
+    if os.path.islink(path) or not os.path.isdir(path):
+        try:
+            size = _disk_bytes(os.lstat(path))
+            os.unlink(path)
+            return size
+        except OSError:
+            return 0
+    
+    freed = _clear_dir(path)
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+    return freed
+
+def _clear_dir(path):
+    """Delete everything inside a directory, returning bytes freed"""
+    freed = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                freed += _remove_tree(entry.path)
+    except OSError:
+        pass
+    return freed
+
+# In-process rm -rf: files are unlinked in batches on a thread pool so the
+# deletes reach the device with some queue depth instead of one at a time
+_RMTREE_BATCH = 1024
+_RMTREE_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+def _unlink_batch(batch):
+    """Unlink (path, size) pairs, returning the bytes actually freed"""
+    freed = 0
+    for path, size in batch:
+        try:
+            os.unlink(path)
+            freed += size
+        except OSError:
+            pass
+    return freed
+
+def _parallel_clear_dir(path):
+    """
+    Like _clear_dir, but with the file unlinks spread across a thread pool.
+    
+    At most _RMTREE_WORKERS * 2 batches are in flight - the walk waits for one
+    to finish before queueing more, so memory stays bounded on huge trees.
+    """
+    dirs = []
+    pending = set()
+    batch = []
+    freed = 0
+    with ThreadPoolExecutor(max_workers=_RMTREE_WORKERS) as executor:
+        def submit(batch):
+            nonlocal freed, pending
+            if len(pending) >= _RMTREE_WORKERS * 2:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                freed += sum(f.result() for f in done)
+            pending.add(executor.submit(_offload, _unlink_batch, batch))
+        
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                dirs.append(entry.path)
+                                stack.append(entry.path)
+                                continue
+                            batch.append((entry.path, _disk_bytes(entry.stat(follow_symlinks=False))))
+                        except OSError:
+                            continue
+                        if len(batch) >= _RMTREE_BATCH:
+                            submit(batch)
+                            batch = []
+            except OSError:
+                pass
+        if batch:
+            submit(batch)
+    freed += sum(f.result() for f in pending)
+    
+    # Every directory was found after its parent, so reversed order is bottom-up
+    for d in reversed(dirs):
+        try:
+            os.rmdir(d)
+        except OSError:
+            pass
+    return freed
+
+def _delete_tree(path, contents_only=False):
+    """
+    rm -rf path (or path/* with contents_only), returning bytes freed.
+    
+    Spinning disks get the sequential delete - parallel unlinks there only
+    add seeks.
+    """
+    if contents_only:
+        if not os.path.isdir(path):
+            return 0
+    elif os.path.islink(path) or not os.path.isdir(path):
+        return _remove_tree(path)
+    
+    if _is_rotational(path):
+        freed = _clear_dir(path)
+    else:
+        freed = _parallel_clear_dir(path)
+    if not contents_only:
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+    return freed
+
+def _run_capped(args, limit, timeout=60, stderr=subprocess.PIPE, **popen_kwargs):
+    """
+    subprocess.run() that keeps only the first `limit` bytes of stdout/stderr.
+    
+    The rest is read and thrown away rather than closing the pipe early - a
+    SIGPIPE would kill commands like `docker system prune` halfway through.
+    
+    Returns: CompletedProcess with (truncated) text output
+    """
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr, **popen_kwargs)
+    timed_out = threading.Event()
+    def on_timeout():
+        timed_out.set()
+        proc.kill()
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    
+    def drain(pipe, kept):
+        kept.append(pipe.read(limit))
+        while pipe.read(65536):
+            pass
+        pipe.close()
+    
+    out, err = [], []
+    try:
+        err_reader = None
+        if proc.stderr:
+            err_reader = threading.Thread(target=drain, args=(proc.stderr, err), daemon=True)
+            err_reader.start()
+        drain(proc.stdout, out)
+        if err_reader:
+            err_reader.join()
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout)
+    
+    decode = lambda kept: kept[0].decode('utf-8', errors='replace') if kept else ''
+    return subprocess.CompletedProcess(args, returncode, decode(out), decode(err) if proc.stderr else None)
+
+def _run_cleanup_command(cmd, timeout=60, output_limit=None):
+    """
+    Run one of a bloat source's expanded_cleanup_commands.
+    
+    `rm -rf <path>` and `rm -rf <path>/*` are done in-process with scandir
+    instead of forking a shell. Other commands run as an argv list; a trailing
+    `2>/dev/null || true` is honoured in Python (stderr discarded, failure and
+    a missing binary reported as success). Only commands with any other shell
+    syntax fall back to shell=True.
+    
+    output_limit caps how much of the command's stdout/stderr is kept (None
+    keeps everything) - prune commands can print megabytes of IDs.
+    
+    Returns: (CompletedProcess, freed) - freed is the number of bytes removed
+    for in-process deletes, or None when the command ran externally.
+    """
+    def run(args, stderr=subprocess.PIPE, **kwargs):
+        if output_limit is None:
+            return subprocess.run(args, stdout=subprocess.PIPE, stderr=stderr, text=True,
+                                  timeout=timeout, **kwargs)
+        return _run_capped(args, output_limit, timeout, stderr=stderr, **kwargs)
+    
+    ignore_errors = _IGNORE_ERRORS_SUFFIX.search(cmd)
+    core = cmd[:ignore_errors.start()] if ignore_errors else cmd
+    argv = shlex.split(core)
+    if len(argv) == 3 and argv[:2] == ['rm', '-rf'] and argv[2] not in ('/', '/*'):
+        target = argv[2]
+        if target.endswith('/*'):
+            freed = _delete_tree(target[:-2], contents_only=True)
+        else:
+            freed = _delete_tree(target)
+        return subprocess.CompletedProcess(cmd, 0, '', ''), freed
+    
+    if _SHELL_SYNTAX.search(core):
+        return run(cmd, shell=True), None
+    
+    stderr = subprocess.DEVNULL if ignore_errors and ignore_errors.group(1) else subprocess.PIPE
+    try:
+        result = run(argv, stderr=stderr)
+    except FileNotFoundError:
+        # What the shell would have reported for a missing command
+        message = '' if stderr is subprocess.DEVNULL else f'{argv[0]}: command not found\n'
+        result = subprocess.CompletedProcess(cmd, 127, '', message)
+    if ignore_errors:
+        result.returncode = 0
+    return result, None
+
+def _run_cleanup_phases(source, run):
+    """
+    Call run(cmd, expanded_cmd) for each of a source's cleanup commands.
+    
+    Consecutive commands of the same kind - deletes, or anything else (daemon
+    stops, masks, cache purges) - are independent of each other and run
+    concurrently; the groups themselves still run in order, so a stop always
+    finishes before the delete that follows it.
+    
+    Returns: run()'s results, in command order.
+    """
+    phases = []
+    last_kind = None
+    for pair in zip(source['cleanup_commands'], source['expanded_cleanup_commands']):
+        kind = pair[1].startswith('rm ')
+        if phases and kind == last_kind:
+            phases[-1].append(pair)
+        else:
+            phases.append([pair])
+        last_kind = kind
+    
+    results = []
+    for phase in phases:
+        if len(phase) == 1:
+            results.append(run(*phase[0]))
+            continue
+        with ThreadPoolExecutor(max_workers=len(phase)) as executor:
+            results.extend(executor.map(lambda pair: run(*pair), phase))
+    return results
+
 @app.route('/api/disk/health')
 def api_disk_health():
     """Get disk health status with alerts"""
@@ -8396,8 +9971,6 @@ def api_disk_health():
         'used': usage['used'],
         'percent': usage['percent']
     })
-    if len(_disk_history) > _disk_history_max:
-        _disk_history.pop(0)
     
     return jsonify({
         'status': status,
@@ -8429,7 +10002,7 @@ def api_disk_large_files():
     info('DISK', f'Scanning for large files (min: {min_size}MB)')
     
     try:
-        files = _find_large_files(min_size_mb=min_size, max_results=max_results)
+        files = [_with_size_human(f) for f in _find_large_files(min_size_mb=min_size, max_results=max_results)]
         total_size = sum(f['size'] for f in files)
         
         return jsonify({
@@ -8452,6 +10025,10 @@ def api_disk_bloat():
     try:
         bloat = _detect_bloat()
         total_bloat = sum(b['total_size'] for b in bloat)
+        for source in bloat:
+            _with_size_human(source, 'total_size')
+            for found in source['paths']:
+                _with_size_human(found)
         
         # Also get disk usage for context
         usage = _get_disk_usage()
@@ -8499,47 +10076,38 @@ def api_disk_cleanup():
     info('DISK', f"Starting cleanup of {source['name']}")
     
     # Get size before cleanup
-    size_before = sum(_get_dir_size(p) for p in source['paths'])
+    size_before = sum(_recent_bloat_size(p) for p in source['expanded_paths'])
     
-    # Run cleanup commands
-    results = []
-    for cmd in source['cleanup_commands']:
+    # Run cleanup commands (~ already expanded at startup)
+    def run(cmd, expanded_cmd):
         try:
-            # Expand ~ in commands
-            expanded_cmd = cmd
-            for path in source['paths']:
-                if '~' in path:
-                    expanded_cmd = expanded_cmd.replace(path, _expand_path(path))
-            
-            result = subprocess.run(
-                expanded_cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            results.append({
+            result, _ = _run_cleanup_command(expanded_cmd, timeout=60, output_limit=500)
+            return {
                 'command': cmd,
                 'success': result.returncode == 0,
                 'stdout': result.stdout[:500] if result.stdout else '',
                 'stderr': result.stderr[:500] if result.stderr else '',
-            })
+            }
         except subprocess.TimeoutExpired:
-            results.append({
+            return {
                 'command': cmd,
                 'success': False,
                 'error': 'Command timed out'
-            })
+            }
         except Exception as e:
-            results.append({
+            return {
                 'command': cmd,
                 'success': False,
                 'error': str(e)
-            })
+            }
+    
+    results = _run_cleanup_phases(source, run)
     
     # Get size after cleanup
-    size_after = sum(_get_dir_size(p) for p in source['paths'])
+    size_after = _bloat_paths_size(source['expanded_paths'])
     freed = size_before - size_after
+    for p in source['expanded_paths']:
+        _bloat_sizes.pop(p, None)
     
     info('DISK', f"Cleanup complete: freed {format_bytes(freed)}")
     
@@ -8593,35 +10161,27 @@ def api_disk_cleanup_all():
             continue
         
         # Run cleanup
-        cmd_results = []
-        for cmd in source_config['cleanup_commands']:
+        def run(cmd, expanded_cmd):
             try:
-                expanded_cmd = cmd
-                for path in source_config['paths']:
-                    if '~' in path:
-                        expanded_cmd = expanded_cmd.replace(path, _expand_path(path))
-                
-                result = subprocess.run(
-                    expanded_cmd,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                cmd_results.append({
+                result, _ = _run_cleanup_command(expanded_cmd, timeout=60, output_limit=0)
+                return {
                     'command': cmd,
                     'success': result.returncode == 0
-                })
+                }
             except Exception as e:
-                cmd_results.append({
+                return {
                     'command': cmd,
                     'success': False,
                     'error': str(e)
-                })
+                }
+        
+        cmd_results = _run_cleanup_phases(source_config, run)
         
         # Get size after
-        size_after = sum(_get_dir_size(p) for p in source_config['paths'])
+        size_after = _bloat_paths_size(source_config['expanded_paths'])
         freed = size_before - size_after
+        for p in source_config['expanded_paths']:
+            _bloat_sizes.pop(p, None)
         total_freed += freed
         
         results.append({
@@ -8633,7 +10193,7 @@ def api_disk_cleanup_all():
         })
     
     # Get new disk status
-    usage = _get_disk_usage()
+    usage = _get_disk_usage(fresh=True)
     
     info('DISK', f"Cleanup all complete: freed {format_bytes(total_freed)}")
     
@@ -8693,10 +10253,32 @@ MEMORY_THRESHOLD_WARNING = 70
 MEMORY_THRESHOLD_CRITICAL = 85
 MEMORY_THRESHOLD_EMERGENCY = 95
 
+# /api/memory/health is polled by the dashboard - share one meminfo/swaps read
+# per MEMORY_INFO_TTL. Anything measuring before/after must invalidate first.
+MEMORY_INFO_TTL = 0.2  # seconds
+_mem_cache = {'ts': 0.0, 'data': None, 'hits': 0, 'misses': 0}
+
+def _invalidate_mem_cache():
+    """Force the next _get_memory_info() to read fresh numbers"""
+    _mem_cache['data'] = None
+
 def _get_memory_info():
     """Get detailed memory information"""
     if not PSUTIL_AVAILABLE:
         return None
+    now = time.monotonic()
+    if _mem_cache['data'] is not None and now - _mem_cache['ts'] < MEMORY_INFO_TTL:
+        _mem_cache['hits'] += 1
+        return _mem_cache['data']
+    _mem_cache['misses'] += 1
+    data = _read_memory_info()
+    if data is not None:
+        _mem_cache['data'] = data
+        _mem_cache['ts'] = now
+    return data
+
+def _read_memory_info():
+    """Uncached body of _get_memory_info"""
     try:
         mem = psutil.virtual_memory()
         swap = psutil.swap_memory()
@@ -8721,32 +10303,134 @@ def _get_memory_info():
         error('MEMORY', f'Failed to get memory info: {e}')
         return None
 
+# /proc/<pid>/stat state letters, named the way psutil reports them
+_PROC_STATUS = {
+    'R': 'running', 'S': 'sleeping', 'D': 'disk-sleep', 'Z': 'zombie',
+    'T': 'stopped', 't': 'tracing-stop', 'X': 'dead', 'x': 'dead',
+    'I': 'idle', 'P': 'parked', 'W': 'waking', 'K': 'wake-kill'
+}
+# (pid, starttime) -> (utime + stime ticks, monotonic time) from the previous
+# /proc scan, for cpu_percent between calls like psutil's cached Process objects
+_proc_cpu_samples = {}
+
+@lru_cache(maxsize=256)
+def _uid_name(uid):
+    """Username for uid (cached - NSS lookups are slow)"""
+    try:
+        return pwd.getpwuid(uid).pw_name if pwd else str(uid)
+    except KeyError:
+        return str(uid)
+
+def _scan_proc_processes():
+    """
+    Same rows as the psutil loop in _get_top_processes, read straight from
+    /proc: one stat() of /proc/<pid> for the owner and one read of
+    /proc/<pid>/stat for everything else, instead of psutil's several files
+    per process. Linux only.
+    """
+    ticks = os.sysconf('SC_CLK_TCK')
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total_mem = os.sysconf('SC_PHYS_PAGES') * page_size
+    boot_time = psutil.boot_time()
+    now = time.time()
+    mono = time.monotonic()
+    
+    processes = []
+    samples = {}
+    with os.scandir('/proc') as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                uid = entry.stat().st_uid
+                with open(f'/proc/{entry.name}/stat', 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue  # exited while we were looking
+            
+            pid = int(entry.name)
+            head, _, tail = raw.rpartition(b')')
+            fields = tail.split()
+            # Field n of proc(5) is fields[n - 3] here
+            rss = int(fields[21]) * page_size
+            memory_percent = rss / total_mem * 100
+            if memory_percent < 0.01:
+                continue
+            
+            starttime = int(fields[19])
+            cpu_ticks = int(fields[11]) + int(fields[12])
+            samples[(pid, starttime)] = (cpu_ticks, mono)
+            previous = _proc_cpu_samples.get((pid, starttime))
+            cpu_percent = 0.0
+            if previous and mono > previous[1]:
+                cpu_percent = (cpu_ticks - previous[0]) / ticks / (mono - previous[1]) * 100
+            
+            name = head.partition(b'(')[2].decode('utf-8', errors='replace')
+            if len(name) >= 15:
+                # comm is truncated to 15 chars - take the full name from argv[0]
+                try:
+                    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                        argv0 = f.read().split(b'\0', 1)[0]
+                    if argv0:
+                        full = os.path.basename(argv0.decode('utf-8', errors='replace'))
+                        if full.startswith(name):
+                            name = full
+                except OSError:
+                    pass
+            
+            processes.append({
+                'pid': pid,
+                'name': name or 'Unknown',
+                'user': _uid_name(uid),
+                'memory_percent': round(memory_percent, 2),
+                'cpu_percent': round(cpu_percent, 2),
+                'memory_mb': round(rss / (1024 * 1024), 1),
+                'status': _PROC_STATUS.get(fields[0].decode(), fields[0].decode()),
+                'uptime': int(now - (boot_time + starttime / ticks)),
+            })
+    
+    _proc_cpu_samples.clear()
+    _proc_cpu_samples.update(samples)
+    return processes
+
+def _psutil_processes():
+    """Process rows for _get_top_processes via psutil (non-Linux fallback)"""
+    processes = []
+    for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent', 'memory_info', 'status', 'create_time']):
+        try:
+            info = proc.info
+            # Skip kernel processes and zombies with no memory
+            if info['memory_percent'] is None or info['memory_percent'] < 0.01:
+                continue
+            
+            processes.append({
+                'pid': info['pid'],
+                'name': info['name'] or 'Unknown',
+                'user': info['username'] or 'system',
+                'memory_percent': round(info['memory_percent'], 2),
+                'cpu_percent': round(info['cpu_percent'] or 0, 2),
+                'memory_mb': round((info['memory_info'].rss if info['memory_info'] else 0) / (1024 * 1024), 1),
+                'status': info['status'],
+                'uptime': int(time.time() - info['create_time']) if info['create_time'] else 0,
+            })
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return processes
+
 def _get_top_processes(sort_by='memory', limit=20):
     """Get top processes by memory or CPU usage"""
     if not PSUTIL_AVAILABLE:
         return []
     
-    processes = []
     try:
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent', 'memory_info', 'status', 'create_time']):
+        processes = None
+        if IS_LINUX:
             try:
-                info = proc.info
-                # Skip kernel processes and zombies with no memory
-                if info['memory_percent'] is None or info['memory_percent'] < 0.01:
-                    continue
-                
-                processes.append({
-                    'pid': info['pid'],
-                    'name': info['name'] or 'Unknown',
-                    'user': info['username'] or 'system',
-                    'memory_percent': round(info['memory_percent'], 2),
-                    'cpu_percent': round(info['cpu_percent'] or 0, 2),
-                    'memory_mb': round((info['memory_info'].rss if info['memory_info'] else 0) / (1024 * 1024), 1),
-                    'status': info['status'],
-                    'uptime': int(time.time() - info['create_time']) if info['create_time'] else 0,
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+                processes = _scan_proc_processes()
+            except (OSError, ValueError, IndexError) as e:
+                debug('MEMORY', f'/proc scan failed, using psutil: {e}')
+        if processes is None:
+            processes = _psutil_processes()
         
         # Sort by requested field
         if sort_by == 'cpu':
@@ -8769,6 +10453,15 @@ PROTECTED_PROCESSES = {
     'acpi_thermal', 'nvme-wq', 'ipv6_addrconf', 'sshd', 'login',
     'dockerd', 'containerd', 'docker', 'shellder'
 }
+PROTECTED_EXACT = frozenset(PROTECTED_PROCESSES)
+
+# One pass over the name instead of a str.__contains__ per protected entry
+PROTECTED_RE = re.compile('|'.join(map(re.escape, sorted(PROTECTED_PROCESSES))))
+
+def _is_protected(proc_name):
+    """True if the process name is, or contains, a protected name"""
+    name = proc_name.lower()
+    return name in PROTECTED_EXACT or PROTECTED_RE.search(name) is not None
 
 @app.route('/api/memory/health')
 def api_memory_health():
@@ -8796,7 +10489,7 @@ def api_memory_health():
     # Calculate clearable cache
     clearable = mem_info['ram']['cached'] + mem_info['ram']['buffers']
     
-    return jsonify({
+    response = {
         'status': status,
         'message': message,
         'ram': {
@@ -8825,7 +10518,14 @@ def api_memory_health():
             'emergency': MEMORY_THRESHOLD_EMERGENCY,
         },
         'timestamp': datetime.now().isoformat()
-    })
+    }
+    if request.args.get('debug') == '1':
+        response['cache'] = {
+            'ttl': MEMORY_INFO_TTL,
+            'hits': _mem_cache['hits'],
+            'misses': _mem_cache['misses']
+        }
+    return jsonify(response)
 
 @app.route('/api/memory/processes')
 def api_memory_processes():
@@ -8846,40 +10546,45 @@ def api_memory_processes():
         'timestamp': datetime.now().isoformat()
     })
 
+def _write_drop_caches():
+    """Drop page cache, dentries and inodes (the write blocks while the kernel
+    reclaims them)"""
+    with open('/proc/sys/vm/drop_caches', 'wb') as f:
+        f.write(b'3')
+
 @app.route('/api/memory/clear-cache', methods=['POST'])
 def api_memory_clear_cache():
     """Clear memory cache (sync and drop caches)"""
     info('MEMORY', 'Clearing memory cache')
     
     try:
-        # First sync to flush file buffers
-        subprocess.run(['sync'], timeout=30)
+        # First sync to flush file buffers (same syscall the sync binary makes) -
+        # on a native thread, since it can block for seconds under eventlet
+        _offload(os.sync)
         
         # Get memory before
+        _invalidate_mem_cache()
         mem_before = _get_memory_info()
         cached_before = mem_before['ram']['cached'] + mem_before['ram']['buffers'] if mem_before else 0
         
         # Drop caches (requires root)
         # 1 = page cache, 2 = dentries/inodes, 3 = all
-        result = subprocess.run(
-            'echo 3 | sudo tee /proc/sys/vm/drop_caches',
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode != 0:
-            # Try without sudo (in case running as root)
+        try:
+            _offload(_write_drop_caches)
+        except OSError:
+            # Not root (or /proc mounted read-only) - let sudo do the write, without prompting for a password
             result = subprocess.run(
-                'echo 3 > /proc/sys/vm/drop_caches',
-                shell=True,
+                ['sudo', '-n', 'tee', '/proc/sys/vm/drop_caches'],
+                input='3\n',
                 capture_output=True,
                 text=True,
                 timeout=30
             )
+            if result.returncode != 0:
+                warn('MEMORY', f'drop_caches not written: {result.stderr.strip()}')
         
         # Get memory after
+        _invalidate_mem_cache()
         mem_after = _get_memory_info()
         cached_after = mem_after['ram']['cached'] + mem_after['ram']['buffers'] if mem_after else 0
         freed = cached_before - cached_after
@@ -8911,7 +10616,7 @@ def api_memory_kill_process(pid):
         proc_name = proc.name()
         
         # Check if protected
-        if proc_name.lower() in PROTECTED_PROCESSES or any(p in proc_name.lower() for p in PROTECTED_PROCESSES):
+        if _is_protected(proc_name):
             return jsonify({
                 'error': f'Cannot kill protected process: {proc_name}',
                 'protected': True
@@ -8961,7 +10666,7 @@ def api_memory_restart_process(pid):
         cmdline = proc.cmdline()
         
         # Check if protected
-        if proc_name.lower() in PROTECTED_PROCESSES:
+        if proc_name.lower() in PROTECTED_EXACT:
             return jsonify({
                 'error': f'Cannot restart protected process: {proc_name}',
                 'protected': True
@@ -9037,7 +10742,7 @@ def api_memory_kill_high_memory():
             break
         
         # Skip protected processes
-        if proc['name'].lower() in PROTECTED_PROCESSES:
+        if proc['name'].lower() in PROTECTED_EXACT:
             continue
         
         # Skip low memory processes
@@ -9047,6 +10752,7 @@ def api_memory_kill_high_memory():
         try:
             p = psutil.Process(proc['pid'])
             p.terminate()
+            _invalidate_mem_cache()
             try:
                 p.wait(timeout=3)
             except psutil.TimeoutExpired:
@@ -9060,15 +10766,16 @@ def api_memory_kill_high_memory():
             
             info('MEMORY', f'Emergency killed: {proc["name"]} (PID {proc["pid"]})')
             
-            # Check if we've freed enough
-            new_mem = _get_memory_info()
-            if new_mem and new_mem['ram']['percent'] <= target_percent:
+            # Check if we've freed enough - the process has been reaped by now,
+            # so its memory is already back; only RAM matters (skip swap stats)
+            if psutil.virtual_memory().percent <= target_percent:
                 break
                 
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
     
     # Get final memory state
+    _invalidate_mem_cache()
     final_mem = _get_memory_info()
     
     return jsonify({
@@ -9087,13 +10794,46 @@ def api_containers():
     if LOCAL_MODE or docker_client is None:
         return jsonify(get_mock_status()['containers']['list'])
     
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(list(stats.get('containers', {}).values()))
 
 # Cache for image update checks (to avoid hammering Docker Hub)
-_image_update_cache = {}
-_image_update_cache_time = {}
+# image name -> (time.time() stored, update info), oldest first
+_image_update_cache = OrderedDict()
 IMAGE_UPDATE_CACHE_SECONDS = 300  # Cache update status for 5 minutes
+IMAGE_UPDATE_CACHE_MAX = 256  # ephemeral tags would otherwise pile up forever
+
+def _image_update_cache_get(image_name):
+    """Cached update info for an image, or None if missing/expired"""
+    ts, update_info = _image_update_cache.get(image_name, (0, None))
+    if time.time() - ts < IMAGE_UPDATE_CACHE_SECONDS:
+        return update_info
+    return None
+
+def _image_update_cache_put(image_name, update_info):
+    """Store update info, evicting the oldest entry past IMAGE_UPDATE_CACHE_MAX"""
+    _image_update_cache[image_name] = (time.time(), update_info)
+    _image_update_cache.move_to_end(image_name)
+    if len(_image_update_cache) > IMAGE_UPDATE_CACHE_MAX:
+        _image_update_cache.popitem(last=False)
+
+# Local images indexed by id and by tag - one images.list() call instead of an
+# images.get() round trip per container
+IMAGE_INDEX_TTL = 30  # seconds
+_image_index_cache = {'ts': 0.0, 'data': None}
+
+def _image_index():
+    """Return ({image id: Image}, {tag: Image}) for all local images"""
+    now = time.monotonic()
+    if _image_index_cache['data'] is None or now - _image_index_cache['ts'] >= IMAGE_INDEX_TTL:
+        by_id, by_tag = {}, {}
+        for img in docker_client.images.list():
+            by_id[img.id] = img
+            for tag in img.tags:
+                by_tag[tag] = img
+        _image_index_cache['data'] = (by_id, by_tag)
+        _image_index_cache['ts'] = now
+    return _image_index_cache['data']
 
 @app.route('/api/containers/updates')
 def api_containers_updates():
@@ -9107,27 +10847,27 @@ def api_containers_updates():
     
     try:
         containers = docker_client.containers.list(all=True)
+        images_by_id, images_by_tag = _image_index()
         
         for container in containers:
             try:
-                image_name = container.image.tags[0] if container.image.tags else None
+                # container.image would be another daemon call - use the index
+                image = images_by_id.get(container.attrs.get('Image')) or container.image
+                image_name = image.tags[0] if image.tags else None
                 if not image_name:
                     continue
                 
                 # Check cache first
-                cache_key = image_name
-                now = time.time()
-                if cache_key in _image_update_cache:
-                    cache_time = _image_update_cache_time.get(cache_key, 0)
-                    if now - cache_time < IMAGE_UPDATE_CACHE_SECONDS:
-                        updates[container.name] = _image_update_cache[cache_key]
-                        if _image_update_cache[cache_key].get('update_available'):
-                            available += 1
-                        checked += 1
-                        continue
+                cached = _image_update_cache_get(image_name)
+                if cached is not None:
+                    updates[container.name] = cached
+                    if cached.get('update_available'):
+                        available += 1
+                    checked += 1
+                    continue
                 
                 # Get local image ID
-                local_id = container.image.short_id
+                local_id = image.short_id
                 
                 # Try to check remote - use docker pull with dry-run simulation
                 # We'll compare the image ID after a "docker pull" check
@@ -9142,7 +10882,7 @@ def api_containers_updates():
                 # This uses `docker image inspect` and registry API
                 try:
                     # Get local image creation date
-                    local_image = docker_client.images.get(image_name)
+                    local_image = images_by_tag.get(image_name) or docker_client.images.get(image_name)
                     local_created = local_image.attrs.get('Created', '')
                     update_info['local_created'] = local_created[:19] if local_created else 'unknown'
                     
@@ -9156,8 +10896,7 @@ def api_containers_updates():
                     pass
                 
                 # Cache the result
-                _image_update_cache[cache_key] = update_info
-                _image_update_cache_time[cache_key] = now
+                _image_update_cache_put(image_name, update_info)
                 
                 updates[container.name] = update_info
                 checked += 1
@@ -9207,20 +10946,19 @@ def api_container_check_update(name):
         
         # Check if image changed
         new_image = docker_client.images.get(image_name)
+        _image_index_cache['data'] = None  # the tag may point at a new image now
         new_id = new_image.short_id
         
         update_available = old_id != new_id
         
         # Update cache
-        cache_key = image_name
-        _image_update_cache[cache_key] = {
+        _image_update_cache_put(image_name, {
             'image': image_name,
             'local_id': new_id,
             'update_available': update_available,
             'just_updated': update_available,
             'checked_at': datetime.now().isoformat()
-        }
-        _image_update_cache_time[cache_key] = time.time()
+        })
         
         return jsonify({
             'success': True,
@@ -9368,15 +11106,41 @@ def api_container_logs(name):
 def api_container_logs_stream(name):
     """Stream container logs in real-time"""
     def generate():
-        if docker_client:
+        if not docker_client:
+            yield "data: Docker not available\n\n"
+            return
+        # Pipe 'docker logs -f' straight through as bytes: whatever the pipe holds
+        # goes out as one event, with no per-frame decode. Every newline becomes a
+        # new data: field, so the client gets the text back unchanged
+        try:
+            proc = subprocess.Popen(
+                ['docker', 'logs', '-f', '--tail', '10', name],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0
+            )
+        except FileNotFoundError:
+            proc = None
+        if proc is None:
+            # No docker CLI on this host - fall back to the SDK stream
             try:
                 container = docker_client.containers.get(name)
                 for log in container.logs(stream=True, follow=True, tail=10):
                     yield f"data: {log.decode('utf-8', errors='ignore')}\n\n"
             except Exception as e:
                 yield f"data: Error: {str(e)}\n\n"
-        else:
-            yield "data: Docker not available\n\n"
+            return
+        try:
+            fd = proc.stdout.fileno()
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                yield b'data: ' + chunk.replace(b'\r', b'').replace(b'\n', b'\ndata: ') + b'\n\n'
+        finally:
+            # Runs when the client disconnects and the server closes the generator
+            if proc.poll() is None:
+                proc.terminate()
+            proc.stdout.close()
+            proc.wait()
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -9513,6 +11277,29 @@ def api_container_action(name, action):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'details': messages})
 
+# " Container aegis-golbat  Started" lines printed by 'docker compose up'
+_COMPOSE_STARTED_RE = re.compile(r'^\s*Container\s+(\S+)\s+Started\b', re.M)
+
+def _compose_service_states(cwd):
+    """[(service, state)] for the containers 'docker compose ps' lists"""
+    # Go template keeps the output to "service:state" lines - no JSON to decode
+    result = subprocess.run(
+        ['docker', 'compose', 'ps', '--format', '{{.Service}}:{{.State}}'],
+        capture_output=True, text=True, timeout=30, cwd=cwd
+    )
+    if result.returncode != 0:
+        return []
+    states = []
+    for line in result.stdout.splitlines():
+        service, _, state = line.partition(':')
+        if service:
+            states.append((service, state))
+    return states
+
+def _compose_running_services(cwd):
+    """Names of compose services with a running container"""
+    return {service for service, state in _compose_service_states(cwd) if state == 'running'}
+
 @app.route('/api/docker/<action>', methods=['POST'])
 def api_docker_action(action):
     """Docker compose actions - handles running containers gracefully"""
@@ -9523,53 +11310,20 @@ def api_docker_action(action):
     try:
         aegis_root = str(AEGIS_ROOT)
         
-        # Special handling for 'up' action - skip already running containers
+        # 'up --no-recreate' already leaves running services alone, so there is
+        # no need to diff 'compose ps' against 'compose config' first
         if action == 'up':
-            # Check which services are already running
-            ps_result = subprocess.run(
-                ['docker', 'compose', 'ps', '--format', 'json'],
-                capture_output=True, text=True, timeout=30, cwd=aegis_root
-            )
-            
-            running_services = set()
-            if ps_result.returncode == 0 and ps_result.stdout.strip():
-                for line in ps_result.stdout.strip().split('\n'):
-                    try:
-                        container = json.loads(line)
-                        if container.get('State') == 'running':
-                            running_services.add(container.get('Service', ''))
-                    except:
-                        pass
-            
-            # Get all services
-            config_result = subprocess.run(
-                ['docker', 'compose', 'config', '--services'],
-                capture_output=True, text=True, timeout=30, cwd=aegis_root
-            )
-            all_services = set(config_result.stdout.strip().split('\n')) if config_result.returncode == 0 else set()
-            
-            # Find services to start
-            services_to_start = all_services - running_services
-            
-            # Skip shellder if host shellder is running on port 5000
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                if sock.connect_ex(('127.0.0.1', 5000)) == 0:
-                    services_to_start.discard('shellder')
-                sock.close()
-            except:
-                pass
-            
-            if not services_to_start:
-                return jsonify({
-                    'success': True,
-                    'output': 'All containers already running',
-                    'already_running': list(running_services)
-                })
-            
-            # Start only stopped services
-            cmd = ['docker', 'compose', 'up', '-d', '--no-recreate'] + list(services_to_start)
+            cmd = ['docker', 'compose', 'up', '-d', '--no-recreate']
+            
+            # Skip shellder if host shellder is running on port 5000 - the only
+            # case where the service list has to be spelled out
+            if port_listening(5000):
+                config_result = subprocess.run(
+                    ['docker', 'compose', 'config', '--services'],
+                    capture_output=True, text=True, timeout=30, cwd=aegis_root
+                )
+                if config_result.returncode == 0:
+                    cmd += [svc for svc in config_result.stdout.split() if svc != 'shellder']
         elif action == 'down':
             # Graceful shutdown: stop in reverse dependency order
             # First stop services that depend on database, then database
@@ -9630,7 +11384,7 @@ def api_docker_action(action):
             return jsonify({
                 'success': True,
                 'output': output,
-                'services_started': list(services_to_start) if 'services_to_start' in dir() else []
+                'services_started': _COMPOSE_STARTED_RE.findall(output)
             })
         
         return jsonify({
@@ -9641,6 +11395,8 @@ def api_docker_action(action):
         error('DOCKER', f'Docker action {action} failed: {e}')
         return jsonify({'success': False, 'error': str(e)})
 
+UPDATE_ALL_TIMEOUT = 600  # seconds, for the image pull
+
 @app.route('/api/docker/update-all', methods=['POST'])
 def api_docker_update_all():
     """Update all installed containers: pull latest images and recreate only installed containers"""
@@ -9733,20 +11489,18 @@ def api_docker_update_all():
                 'duration': f"{time.time() - start_time:.1f}s"
             })
         
-        # Step 1: Pull latest images for installed containers only
+        # Step 1: Pull latest images for installed containers only - one compose
+        # call, which already pulls the services in parallel
         pull_start = time.time()
-        # Build pull command with specific services
-        pull_cmd = ['docker', 'compose', 'pull'] + installed_containers
         pull_result = subprocess.run(
-            pull_cmd,
-            capture_output=True, text=True, timeout=600,
+            ['docker', 'compose', 'pull'] + installed_containers,
+            capture_output=True, text=True, timeout=UPDATE_ALL_TIMEOUT,
             cwd=str(AEGIS_ROOT)
         )
-        pull_duration = f"{time.time() - pull_start:.1f}s"
         steps.append({
             'name': f'Pull latest images ({len(installed_containers)} containers)',
             'success': pull_result.returncode == 0,
-            'duration': pull_duration,
+            'duration': f"{time.time() - pull_start:.1f}s",
             'containers': installed_containers
         })
         all_output.append(f"=== Pull Images (Installed Only) ===\nContainers: {', '.join(installed_containers)}\n{pull_result.stdout}\n{pull_result.stderr}")
@@ -9760,31 +11514,28 @@ def api_docker_update_all():
                 'duration': f"{time.time() - start_time:.1f}s"
             })
         
-        # Step 2: Recreate only installed containers with new images
+        # Step 2: Recreate installed containers in one call, so compose applies
+        # depends_on ordering (database before golbat, golbat before dragonite...)
         up_start = time.time()
-        # Build up command with specific services
         up_cmd = ['docker', 'compose', 'up', '-d', '--force-recreate'] + installed_containers
         up_result = subprocess.run(
             up_cmd,
             capture_output=True, text=True, timeout=300,
             cwd=str(AEGIS_ROOT)
         )
-        up_duration = f"{time.time() - up_start:.1f}s"
         steps.append({
             'name': f'Recreate containers ({len(installed_containers)} containers)',
             'success': up_result.returncode == 0,
-            'duration': up_duration,
+            'duration': f"{time.time() - up_start:.1f}s",
             'containers': installed_containers
         })
         all_output.append(f"=== Recreate Containers (Installed Only) ===\nContainers: {', '.join(installed_containers)}\n{up_result.stdout}\n{up_result.stderr}")
         
-        total_duration = f"{time.time() - start_time:.1f}s"
-        
         return jsonify({
             'success': up_result.returncode == 0,
             'steps': steps,
             'output': '\n'.join(all_output),
-            'duration': total_duration,
+            'duration': f"{time.time() - start_time:.1f}s",
             'updated_containers': installed_containers,
             'count': len(installed_containers)
         })
@@ -10019,8 +11770,6 @@ def api_docker_health():
 @app.route('/api/docker/port-check')
 def api_docker_port_check():
     """Check accessibility of container ports - dynamically discovers from running containers"""
-    import socket
-    import time
     
     ports = []
     running_containers = []
@@ -10801,7 +12550,7 @@ def api_docker_logging_restart():
 @app.route('/api/xilriws/stats')
 def api_xilriws_stats():
     """Get Xilriws proxy statistics"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('xilriws', {}))
 
 @app.route('/api/xilriws/live')
@@ -10973,7 +12722,7 @@ def api_xilriws_proxy_stats(proxy_address):
                 conn.close()
         
         # Get current session stats from live stats collector
-        stats = stats_collector.get_all_stats()
+        stats = stats_collector.get_all_stats(shallow=True)
         xilriws_stats = stats.get('xilriws', {})
         proxy_stats = xilriws_stats.get('proxy_stats', {})
         
@@ -11160,15 +12909,6 @@ def get_xilriws_chrome_temp_info():
     return result
 
 
-def format_bytes(bytes_val):
-    """Format bytes to human readable string"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if abs(bytes_val) < 1024.0:
-            return f"{bytes_val:.1f} {unit}"
-        bytes_val /= 1024.0
-    return f"{bytes_val:.1f} PB"
-
-
 def clean_xilriws_chrome_temp(max_age_days=None, max_size_bytes=None, clean_all=False):
     """Clean Chrome temp files in Xilriws container"""
     result = {
@@ -14000,23 +15740,16 @@ def api_wizard_status():
         6004: 'Koji',
         7070: 'Rotom Device Port'
     }
-    ports_status = {}
-    all_ports_free = True
-    
-    import socket
-    for port, service in required_ports.items():
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('127.0.0.1', port))
-            sock.close()
-            # Port is free if connect fails (connection refused)
-            is_free = result != 0
-            ports_status[port] = {'service': service, 'free': is_free}
-            if not is_free:
-                all_ports_free = False
-        except:
-            ports_status[port] = {'service': service, 'free': True}
+    # Probe all ports at once - a port is free if nothing accepts the connect
+    try:
+        listening = probe_ports(list(required_ports), timeout=1)
+    except OSError:
+        listening = probe_ports_threaded(list(required_ports), timeout=1)
+    ports_status = {
+        port: {'service': service, 'free': not listening[port]}
+        for port, service in required_ports.items()
+    }
+    all_ports_free = all(p['free'] for p in ports_status.values())
     
     status['steps']['ports'] = {
         'name': 'Port Availability',
@@ -14551,45 +16284,23 @@ def api_wizard_start_stack():
     
     try:
         # First, get list of services that are NOT running
-        ps_result = subprocess.run(
-            ['docker', 'compose', 'ps', '--format', 'json'],
-            capture_output=True, text=True, timeout=30, cwd=aegis_root
-        )
-        
-        running_services = set()
-        if ps_result.returncode == 0 and ps_result.stdout.strip():
-            import json as json_mod
-            for line in ps_result.stdout.strip().split('\n'):
-                try:
-                    container = json_mod.loads(line)
-                    if container.get('State') == 'running':
-                        running_services.add(container.get('Service', ''))
-                except:
-                    pass
+        running_services = _compose_running_services(aegis_root)
         
         # Get all services from compose file
         config_result = subprocess.run(
             ['docker', 'compose', 'config', '--services'],
             capture_output=True, text=True, timeout=30, cwd=aegis_root
         )
-        all_services = set(config_result.stdout.strip().split('\n')) if config_result.returncode == 0 else set()
+        all_services = set(config_result.stdout.split()) if config_result.returncode == 0 else set()
         
         # Find services that need to be started (not already running)
         services_to_start = all_services - running_services
         
         # Also exclude shellder if host shellder is running on port 5000
-        try:
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result_check = sock.connect_ex(('127.0.0.1', 5000))
-            sock.close()
-            if result_check == 0:
-                # Port 5000 is in use (host shellder running)
-                services_to_start.discard('shellder')
-                info('DOCKER', 'Skipping shellder container - host shellder already running on port 5000')
-        except:
-            pass
+        if port_listening(5000):
+            # Port 5000 is in use (host shellder running)
+            services_to_start.discard('shellder')
+            info('DOCKER', 'Skipping shellder container - host shellder already running on port 5000')
         
         if not services_to_start:
             return jsonify({
@@ -14611,23 +16322,13 @@ def api_wizard_start_stack():
         )
         
         # Check final status
-        final_ps = subprocess.run(
-            ['docker', 'compose', 'ps', '--format', 'json'],
-            capture_output=True, text=True, timeout=30, cwd=aegis_root
-        )
-        
         final_running = []
         final_failed = []
-        if final_ps.returncode == 0 and final_ps.stdout.strip():
-            for line in final_ps.stdout.strip().split('\n'):
-                try:
-                    container = json_mod.loads(line)
-                    if container.get('State') == 'running':
-                        final_running.append(container.get('Service', ''))
-                    else:
-                        final_failed.append(container.get('Service', ''))
-                except:
-                    pass
+        for service, state in _compose_service_states(aegis_root):
+            if state == 'running':
+                final_running.append(service)
+            else:
+                final_failed.append(service)
         
         return jsonify({
             'success': True,  # Mark as success if we attempted to start
@@ -16823,12 +18524,10 @@ def api_poracle_restart():
 # PTY is Unix-only - make it optional for Windows development
 try:
     import pty
-    import select
     PTY_AVAILABLE = True
 except ImportError:
     PTY_AVAILABLE = False
     pty = None
-    select = None
 
 # Track active terminal sessions
 terminal_sessions = {}
@@ -16892,7 +18591,6 @@ class TerminalSession:
             
         try:
             # Check if data available (non-blocking)
-            import select
             ready, _, _ = select.select([self.master_fd], [], [], 0.1)
             if ready:
                 data = os.read(self.master_fd, 4096)
@@ -18920,6 +20618,7 @@ def api_github_pull():
         
         # Fix ownership of changed files to prevent root-locked files
         if result.returncode == 0:
+            _refresh_git_info()
             diff_result = subprocess.run(
                 ['git', 'diff', '--name-only', 'HEAD~1'],
                 capture_output=True, text=True, cwd=aegis_root
@@ -18983,6 +20682,8 @@ def api_github_pull_restart():
                 subprocess.run(['git', 'stash', 'pop'], capture_output=True, timeout=30, cwd=aegis_root)
             return jsonify({'success': False, 'steps': steps, 'error': 'Pull failed'})
         
+        _refresh_git_info()
+        
         # Step 2.5: Fix ownership of changed files to prevent root-locked files
         diff_result = subprocess.run(
             ['git', 'diff', '--name-only', 'HEAD~1'],
@@ -20784,13 +22485,13 @@ def api_sites_check():
 @app.route('/api/rotom/stats')
 def api_rotom_stats():
     """Get Rotom device/worker statistics"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('rotom', {}))
 
 @app.route('/api/rotom/devices')
 def api_rotom_devices():
     """Get Rotom device list with status"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('rotom', {}).get('devices', {}))
 
 @app.route('/api/rotom/live')
@@ -20805,7 +22506,7 @@ def api_rotom_live():
 @app.route('/api/koji/stats')
 def api_koji_stats():
     """Get Koji API statistics"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('koji', {}))
 
 @app.route('/api/koji/live')
@@ -20820,7 +22521,7 @@ def api_koji_live():
 @app.route('/api/reactmap/stats')
 def api_reactmap_stats():
     """Get Reactmap build/status info"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('reactmap', {}))
 
 @app.route('/api/reactmap/live')
@@ -20835,7 +22536,7 @@ def api_reactmap_live():
 @app.route('/api/database/stats')
 def api_database_stats():
     """Get MariaDB connection statistics"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('database', {}))
 
 @app.route('/api/database/live')
@@ -21587,13 +23288,13 @@ def api_monitor_instances():
 @app.route('/api/ports')
 def api_ports():
     """Get port status"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(list(stats.get('ports', {}).values()))
 
 @app.route('/api/service-status')
 def api_service_status():
     """Get service status from stats collector (legacy)"""
-    stats = stats_collector.get_all_stats()
+    stats = stats_collector.get_all_stats(shallow=True)
     return jsonify(stats.get('services', {}))
 
 @app.route('/api/logs/stack')
@@ -21879,6 +23580,8 @@ def api_git_pull():
             capture_output=True, text=True, timeout=60,
             cwd=str(AEGIS_ROOT)
         )
+        if result.returncode == 0:
+            _refresh_git_info()
         return jsonify({
             'success': result.returncode == 0,
             'output': result.stdout + result.stderr
@@ -21897,7 +23600,7 @@ def api_files():
     
     # Security: ensure path is within AEGIS_ROOT
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied', 'files': []})
     
@@ -21926,7 +23629,7 @@ def api_file_content():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied'})
     
@@ -21953,7 +23656,7 @@ def api_file_info():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied'})
     
@@ -22007,7 +23710,7 @@ def api_file_save():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22035,7 +23738,7 @@ def api_file_create():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22068,7 +23771,7 @@ def api_file_mkdir():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22095,7 +23798,7 @@ def api_file_delete():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22134,8 +23837,8 @@ def api_file_rename():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
-        new_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
+        new_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22167,7 +23870,7 @@ def api_file_chown():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22216,7 +23919,7 @@ def api_file_chmod():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22253,8 +23956,8 @@ def api_file_copy():
     
     # Security check
     try:
-        source_path.resolve().relative_to(AEGIS_ROOT.resolve())
-        dest_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        source_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
+        dest_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22284,7 +23987,7 @@ def api_file_download():
     
     # Security check
     try:
-        full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -22318,7 +24021,7 @@ def api_file_upload():
     
     # Security check
     try:
-        dest_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        dest_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22372,7 +24075,7 @@ def api_file_chown_all():
     
     # Security check
     try:
-        target_path.resolve().relative_to(AEGIS_ROOT.resolve())
+        target_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
     except ValueError:
         return jsonify({'success': False, 'error': 'Access denied'})
     
@@ -22530,7 +24233,7 @@ def api_files_current_user():
 @app.route('/api/stats/live')
 def api_stats_live():
     """Get all live statistics"""
-    return jsonify(stats_collector.get_all_stats())
+    return jsonify(stats_collector.get_all_stats(shallow=True))
 
 # =============================================================================
 # WEBSOCKET EVENTS
@@ -22561,7 +24264,7 @@ if SOCKETIO_AVAILABLE:
         print(f"Client {request.sid} subscribed to {channel}")
         
         # Send current stats immediately
-        stats = stats_collector.get_all_stats()
+        stats = stats_collector.get_all_stats(shallow=True)
         if channel == 'containers':
             emit('container_stats', stats.get('containers', {}))
         elif channel == 'system':
@@ -22634,7 +24337,7 @@ if SOCKETIO_AVAILABLE:
         
         try:
             full_path = AEGIS_ROOT / path
-            full_path.resolve().relative_to(AEGIS_ROOT.resolve())
+            full_path.resolve().relative_to(_AEGIS_ROOT_RESOLVED)
             
             if action == 'read':
                 if full_path.exists():
@@ -22665,16 +24368,7 @@ if SOCKETIO_AVAILABLE:
         
         try:
             if cmd == 'ps':
-                result = subprocess.run(['docker', 'compose', 'ps', '--format', 'json'],
-                                       capture_output=True, text=True, cwd=str(AEGIS_ROOT), timeout=30)
-                containers = []
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        try:
-                            containers.append(json.loads(line))
-                        except:
-                            pass
-                emit('ai_debug_result', {'type': 'docker', 'cmd': 'ps', 'containers': containers})
+                emit('ai_debug_result', {'type': 'docker', 'cmd': 'ps', 'containers': _compose_ps()})
             elif cmd == 'logs' and container:
                 result = subprocess.run(['docker', 'logs', '--tail', '100', container],
                                        capture_output=True, text=True, timeout=30)
@@ -22748,6 +24442,9 @@ def main():
     if DOCKER_AVAILABLE and docker_client:
         log_docker_state()
     
+    # Read HEAD once up front
+    _refresh_git_info()
+    
     print(f"""
 ╔═══════════════════════════════════════════════════════════════╗
 ║                 SHELLDER SERVICE v1.0                          ║
@@ -22801,10 +24498,18 @@ def main():
     print("Chrome temp cleanup worker started")
     
     # Run Flask with SocketIO
-    if SOCKETIO_AVAILABLE:
+    # Under eventlet, socketio.run() serves through eventlet's WSGI server (a green
+    # thread per request, WebSockets included). Without eventlet, waitress (a
+    # requirement) serves from its thread pool and Socket.IO uses long-polling.
+    if SOCKETIO_AVAILABLE and ASYNC_MODE == 'eventlet':
+        socketio.run(app, host='0.0.0.0', port=SHELLDER_PORT, debug=False)
+    elif WAITRESS_AVAILABLE:
+        print(f"Serving with waitress ({WSGI_THREADS} threads)")
+        waitress_serve(app, host='0.0.0.0', port=SHELLDER_PORT, threads=WSGI_THREADS)
+    elif SOCKETIO_AVAILABLE:
         socketio.run(app, host='0.0.0.0', port=SHELLDER_PORT, debug=False)
     else:
-        app.run(host='0.0.0.0', port=SHELLDER_PORT, debug=False)
+        app.run(host='0.0.0.0', port=SHELLDER_PORT, debug=False, threaded=True)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+SQL Result Values for Shellder
+==============================
+
+PyMySQL hands back Python types (bytes, timedelta, datetime, Decimal) that
+the JSON encoder either rejects or renders differently from the mysql CLI.
+sql_value() turns them into the same plain text the CLI prints, so
+/api/ai-debug/sql returns identical rows on either path.
+
+Usage:
+    from sql_values import sql_value
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+
+def _format_time(value):
+    """TIME column (a timedelta) as MySQL prints it: [-]HH:MM:SS[.ffffff]"""
+    sign = '-' if value < timedelta(0) else ''
+    value = abs(value)
+    hours, rest = divmod(value.days * 86400 + value.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if value.microseconds:
+        text += f".{value.microseconds:06d}"
+    return text
+
+
+def sql_value(value):
+    """Make a driver value JSON-safe, formatted like the mysql CLI output"""
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, timedelta):
+        return _format_time(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, Decimal)):
+        return str(value)
+    return value
@@ -0,0 +1,38 @@
+"""Tests for sql_values.sql_value - PyMySQL row values rendered like the mysql CLI"""
+
+import json
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sql_values import sql_value
+
+
+def test_time_column():
+    assert sql_value(timedelta(hours=12, minutes=34, seconds=56)) == '12:34:56'
+
+
+def test_time_column_beyond_a_day_and_negative():
+    assert sql_value(timedelta(hours=838, minutes=59, seconds=59)) == '838:59:59'
+    assert sql_value(-timedelta(minutes=1, seconds=30)) == '-00:01:30'
+    assert sql_value(timedelta(seconds=1, microseconds=500)) == '00:00:01.000500'
+
+
+def test_datetime_date_and_decimal():
+    assert sql_value(datetime(2024, 1, 2, 3, 4, 5)) == '2024-01-02 03:04:05'
+    assert sql_value(date(2024, 1, 2)) == '2024-01-02'
+    assert sql_value(Decimal('1.50')) == '1.50'
+
+
+def test_bytes_and_passthrough():
+    assert sql_value(b'caf\xc3\xa9') == 'café'
+    assert sql_value(42) == 42
+    assert sql_value(None) is None
+
+
+def test_row_is_json_serializable():
+    row = (timedelta(hours=1), datetime(2024, 1, 1), Decimal('2.5'), b'x')
+    assert json.loads(json.dumps([sql_value(v) for v in row])) == ['01:00:00', '2024-01-01 00:00:00', '2.5', 'x']